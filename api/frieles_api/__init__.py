@@ -0,0 +1,25 @@
+# a local flag rather than `typing.TYPE_CHECKING`: importing typing costs
+# more than the rest of the package; type checkers treat both the same
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+
+def create_app() -> "FastAPI":
+    # imported here so `python -m frieles_api` and the uvicorn reloader
+    # do not load the whole application before it is needed
+    from fastapi import FastAPI
+    from frieles import setup_database
+
+    from .app.dependencies import init_app
+    from .app.routes import metrics_router, router, stats_router
+
+    app = FastAPI(title="Frieles Store")
+    init_app(app)
+    setup_database()
+
+    app.include_router(router)
+    app.include_router(metrics_router)
+    app.include_router(stats_router)
+    return app
@@ -1,9 +1,19 @@
-import uvicorn
+import sys
 
-from .settings import settings
+from frieles.errors import InvalidSettingsError
+
+from .settings import get_settings
 
 
 def main():
+    try:
+        settings = get_settings()
+    except InvalidSettingsError as e:
+        print(e, file=sys.stderr)
+        exit(-1)
+
+    import uvicorn
+
     uvicorn.run(
         "frieles_api:create_app",
         factory=True,
@@ -3,28 +3,39 @@ from typing import Callable
 
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
+from frieles import instrumentation
 from starlette.middleware.cors import CORSMiddleware
 
-from ..settings import settings
+from ..settings import get_settings
 
 
 def init_app(app: FastAPI):
     setup_cors(app)
     setup_error_handler(app)
+    setup_instrumentation(app)
 
 
 def setup_cors(app: FastAPI) -> None:
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.ORIGINS,
+        allow_origins=get_settings().ORIGINS,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
     )
 
 
+def setup_instrumentation(app: FastAPI) -> None:
+    settings = get_settings()
+    if settings.METRICS_ENABLED:
+        instrumentation.add_hook(instrumentation.metrics)
+
+    if settings.OTEL_ENABLED:
+        instrumentation.add_hook(instrumentation.OpenTelemetryHook())
+
+
 def setup_error_handler(app: FastAPI) -> None:
-    if not settings.CATCH_ERRORS:
+    if not get_settings().CATCH_ERRORS:
         return
 
     app.add_exception_handler(ValueError, _exception_wrapper(400))
@@ -1,27 +1,67 @@
+import tarfile
 from typing import Iterable
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import JSONResponse
-from frieles import Store
-from frieles.schemas import BlobbedFile, File
-from pymongo.results import DeleteResult
+from bson import ObjectId
+from fastapi import APIRouter, Form, HTTPException, Query, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    RedirectResponse,
+    StreamingResponse,
+)
+from frieles import Store, instrumentation
+from frieles.archive import import_archive, iter_export
+from frieles.errors import (
+    AmbiguousFileError,
+    BlobExistsError,
+    BlobMismatchError,
+    PresignNotSupportedError,
+)
+from frieles.schemas import (
+    ArchiveImport,
+    BlobbedFile,
+    Creator,
+    File,
+    FileRecord,
+    Location,
+    PresignedUpload,
+)
+from frieles.usage import UsageKey
+from pydantic import Json
 from redbaby.errors import DocumentNotFound
 
-from .schemas import DeleteMany, SearchTag, UpdateOne
+from ..settings import get_settings
+from .schemas import (
+    CompleteUpload,
+    CreateUpload,
+    DeleteMany,
+    PresignedURL,
+    SearchTag,
+    UpdateOne,
+)
 
 router = APIRouter(prefix="/files")
+metrics_router = APIRouter()
+stats_router = APIRouter(prefix="/stats")
 
 
-@router.get("/")
-def find(
-    path: str | None = Query(None),
-    mimetype: str | None = Query(None),
-    provider: str | None = Query(None),
-    search_tags: list[SearchTag] | None = Query(None),
-    return_blob: bool = Query(False),
-    skip: int = 0,
-    limit: int = 0,
-) -> Iterable[BlobbedFile] | Iterable[File]:
+def _records_response(records: FileRecord | Iterable[FileRecord]) -> JSONResponse:
+    if isinstance(records, FileRecord):
+        content = records.to_dict()
+    else:
+        content = [record.to_dict() for record in records]
+    return JSONResponse(
+        content=jsonable_encoder(content, custom_encoder={ObjectId: str}),
+    )
+
+
+def _filters(
+    path: str | None,
+    mimetype: str | None,
+    provider: str | None,
+    search_tags: list[SearchTag] | None,
+) -> dict:
     filters = {}
     if path is not None:
         filters["metadata.path"] = path
@@ -32,41 +72,175 @@ def find(
     if search_tags is not None:
         for search_tag in search_tags:
             filters[f"search_tags.{search_tag.key}"] = search_tag.value
+    return filters
 
-    return Store.read(
-        filters=filters,
+
+@router.get("/")
+def find(
+    path: str | None = Query(None),
+    mimetype: str | None = Query(None),
+    provider: str | None = Query(None),
+    search_tags: list[Json[SearchTag]] | None = Query(None),
+    return_blob: bool = Query(False),
+    fields: list[str] | None = Query(None),
+    raw: bool = Query(False),
+    skip: int = 0,
+    limit: int = 0,
+) -> list[BlobbedFile[Creator]] | list[File[Creator]]:
+    files = Store.read(
+        filters=_filters(path, mimetype, provider, search_tags),
         return_blob=return_blob,
         skip=skip,
         limit=limit,
+        fields=fields,
+        raw=raw,
+    )
+    if raw or fields is not None:
+        return _records_response(files)
+    # validated eagerly, a lazy iterable would be consumed by the first
+    # member of the response union
+    return list(files)
+
+
+@router.get("/export/")
+def export(
+    path: str | None = Query(None),
+    mimetype: str | None = Query(None),
+    provider: str | None = Query(None),
+    search_tags: list[Json[SearchTag]] | None = Query(None),
+) -> StreamingResponse:
+    return StreamingResponse(
+        iter_export(_filters(path, mimetype, provider, search_tags)),
+        media_type="application/x-tar",
+        headers={"Content-Disposition": 'attachment; filename="files.tar"'},
     )
 
 
+@router.post("/import/")
+def import_files(
+    archive: UploadFile,
+    # sent with the upload rather than in the URL, it may hold credentials
+    location: Json[Location] | None = Form(None),
+) -> ArchiveImport:
+    try:
+        return import_archive(archive.file, location=location)
+    except (ValueError, tarfile.TarError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/{blob_ref}/")
-def find_one(blob_ref: str, return_blob: bool = Query()) -> BlobbedFile | File:
+def find_one(
+    blob_ref: str,
+    return_blob: bool = Query(),
+    fields: list[str] | None = Query(None),
+    raw: bool = Query(False),
+) -> BlobbedFile[Creator] | File[Creator]:
+    try:
+        file = Store.read_one(blob_ref, return_blob, fields=fields, raw=raw)
+    except DocumentNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except AmbiguousFileError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if raw or fields is not None:
+        return _records_response(file)
+    return file
+
+
+@router.get("/{blob_ref}/content/")
+def stream(blob_ref: str) -> StreamingResponse:
     try:
-        return Store.read_one(blob_ref, return_blob)
+        content = Store.stream(blob_ref)
     except DocumentNotFound as e:
-        raise HTTPException(status=404, details=str(e))
+        raise HTTPException(status_code=404, detail=str(e))
+    except AmbiguousFileError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return StreamingResponse(content, media_type="application/octet-stream")
+
+
+@router.get("/{blob_ref}/download/", response_model=None)
+def download(
+    blob_ref: str,
+    redirect: bool = Query(True),
+    expires_in: int | None = Query(None),
+) -> RedirectResponse | PresignedURL:
+    if expires_in is None:
+        expires_in = get_settings().PRESIGNED_URL_EXPIRES_IN
+
+    try:
+        url = Store.presign_read(blob_ref, expires_in)
+    except DocumentNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except AmbiguousFileError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except PresignNotSupportedError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if redirect:
+        return RedirectResponse(url, status_code=307)
+    return PresignedURL(url=url, expires_in=expires_in)
+
+
+@router.post("/uploads/", status_code=201)
+def create_upload(upload: CreateUpload) -> PresignedUpload:
+    expires_in = upload.expires_in
+    if expires_in is None:
+        expires_in = get_settings().PRESIGNED_URL_EXPIRES_IN
+
+    try:
+        return Store.presign_create(
+            blob_ref=upload.blob_ref,
+            location=upload.location,
+            expires_in=expires_in,
+            parts=upload.parts,
+        )
+    except BlobExistsError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except PresignNotSupportedError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/uploads/complete/")
+def complete_upload(upload: CompleteUpload):
+    try:
+        Store.complete_create(upload.file, upload.key, upload.upload_id, upload.parts)
+    except DocumentNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (BlobMismatchError, PresignNotSupportedError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return JSONResponse(
+        headers={"Location": f"/files/{upload.file.blob_ref}/"},
+        status_code=201,
+        content={"blob_ref": upload.file.blob_ref},
+    )
 
 
 @router.post("/")
-def create(file: BlobbedFile):
-    result = Store.create_one(file)
+def create(file: BlobbedFile[Creator], chunked: bool = Query(False)):
+    result = Store.create_one(file, chunked=chunked)
     return JSONResponse(
         headers={"Location": f"/files/{result.inserted_id}/"},
         status_code=201,
-        content=result,
+        content={"inserted_id": str(result.inserted_id)},
     )
 
 
 @router.put("/{blob_ref}/", status_code=204)
 def update_one(blob_ref: str, update: UpdateOne) -> None:
-    result = Store.update_one(
-        blob_ref=blob_ref,
-        metadata=update.metadata,
-        location=update.location,
-        search_tags=update.search_tags,
-    )
+    try:
+        result = Store.update_one(
+            blob_ref=blob_ref,
+            metadata=update.metadata,
+            location=update.location,
+            search_tags=update.search_tags,
+        )
+    except DocumentNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except AmbiguousFileError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
     if not result.matched_count:
         raise HTTPException(status_code=404, detail="Document not found.")
 
@@ -75,15 +249,41 @@ def update_one(blob_ref: str, update: UpdateOne) -> None:
 
 
 @router.delete("/{blob_ref}/")
-def delete_one(blob_ref: str) -> DeleteResult:
-    return Store.delete_one(blob_ref)
+def delete_one(blob_ref: str) -> dict[str, int]:
+    try:
+        result = Store.delete_one(blob_ref)
+    except DocumentNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except AmbiguousFileError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return {"deleted_count": result.deleted_count}
 
 
 @router.delete("/bulk/")
-def delete_many(delete_filters: DeleteMany) -> DeleteResult:
-    return Store.delete(
+def delete_many(delete_filters: DeleteMany) -> dict[str, int]:
+    result = Store.delete(
         blob_ref=delete_filters.blob_ref,
         metadata=delete_filters.metadata,
         location=delete_filters.location,
         search_tags=delete_filters.search_tags,
     )
+    return {"deleted_count": result.deleted_count}
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    if not get_settings().METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled.")
+
+    return PlainTextResponse(
+        instrumentation.metrics.render(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@stats_router.get("/")
+def stats(group_by: list[UsageKey] | None = Query(None)) -> JSONResponse:
+    return JSONResponse(
+        content=jsonable_encoder(Store.usage(group_by), custom_encoder={ObjectId: str}),
+    )
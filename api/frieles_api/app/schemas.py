@@ -1,7 +1,8 @@
 from typing import Any
 
-from frieles.schemas import Location, Metadata
-from pydantic import BaseModel
+from frieles.schemas import Creator, Location, Metadata, UploadedFile, UploadedPart
+from pydantic import BaseModel, Field
+from redbaby.hashing import HashDigest
 
 
 class SearchTag(BaseModel):
@@ -17,3 +18,22 @@ class UpdateOne(BaseModel):
 
 class DeleteMany(UpdateOne):
     blob_ref: str
+
+
+class PresignedURL(BaseModel):
+    url: str
+    expires_in: int
+
+
+class CreateUpload(BaseModel):
+    blob_ref: HashDigest
+    location: Location
+    parts: int = Field(1, ge=1, le=10_000)
+    expires_in: int | None = None
+
+
+class CompleteUpload(BaseModel):
+    file: UploadedFile[Creator]
+    key: str
+    upload_id: str | None = None
+    parts: list[UploadedPart] = Field(default_factory=list)
@@ -1,6 +1,7 @@
+import functools
 import pathlib
-import sys
 
+from frieles.errors import InvalidSettingsError
 from pydantic import ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -22,6 +23,13 @@ class Settings(BaseSettings):
     # Error handling
     CATCH_ERRORS: bool = True
 
+    # Pre-signed URLs
+    PRESIGNED_URL_EXPIRES_IN: int = 3600
+
+    # Instrumentation
+    METRICS_ENABLED: bool = True
+    OTEL_ENABLED: bool = False
+
     # BaseSettings config
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -31,13 +39,27 @@ class Settings(BaseSettings):
     )
 
 
-try:
-    settings = Settings()
-except ValidationError as e:
-    directory = pathlib.Path(".").absolute()
-    print(
-        f"The .env file is invalid or could not be "
-        f"found on the current directory={directory}.\nValidation: {e}",
-        file=sys.stderr,
-    )
-    exit(-1)
+@functools.cache
+def get_settings() -> Settings:
+    """
+    Resolve the settings on first use, from the environment and
+    the `.env` file on the current directory.
+
+    :return: The settings.
+    :raises InvalidSettingsError if the settings are missing or invalid.
+    """
+
+    try:
+        return Settings()
+    except ValidationError as e:
+        directory = pathlib.Path(".").absolute()
+        raise InvalidSettingsError(
+            f"The .env file is invalid or could not be "
+            f"found on the current directory={directory}.\nValidation: {e}"
+        ) from e
+
+
+def __getattr__(name: str):
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,47 @@
+import os
+
+os.environ.setdefault("DB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "frieles-test")
+os.environ.setdefault("METRICS_ENABLED", "false")
+
+import boto3  # noqa: E402
+import mongomock  # noqa: E402
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from frieles.schemas import LocalStoreConfig, Location, S3StoreConfig  # noqa: E402
+from moto import mock_aws  # noqa: E402
+from redbaby.database import DB  # noqa: E402
+
+S3_BUCKET = "frieles-test"
+S3_REGION = "us-east-1"
+
+
+@pytest.fixture
+def client():
+    from frieles_api import create_app
+
+    app = create_app()
+    # create_app connects the default alias to DB_URI, swap in mongomock
+    DB.clients["default"] = mongomock.MongoClient()
+    return TestClient(app)
+
+
+@pytest.fixture
+def s3_location():
+    with mock_aws():
+        boto3.client("s3", region_name=S3_REGION).create_bucket(Bucket=S3_BUCKET)
+        yield Location(
+            provider="s3",
+            config=S3StoreConfig(
+                access_key_id="testing",
+                secret_access_key="testing",
+                region=S3_REGION,
+                bucket_name=S3_BUCKET,
+                addressing_style="auto",
+            ),
+        )
+
+
+@pytest.fixture
+def local_location(tmp_path):
+    return Location(provider="local", config=LocalStoreConfig(directory=tmp_path))
@@ -0,0 +1,103 @@
+import io
+import json
+import tarfile
+from datetime import datetime, timezone
+
+import pytest
+from frieles import Store
+from frieles.schemas import (
+    Blob,
+    BlobbedFile,
+    Creator,
+    LocalStoreConfig,
+    Location,
+    Metadata,
+)
+
+
+def store_file(content: bytes, location: Location) -> None:
+    now = datetime.now(tz=timezone.utc)
+    Store.create_one(
+        BlobbedFile[Creator](
+            blob=Blob(content=content),
+            metadata=Metadata(
+                mimetype="text/plain",
+                path="/archive/file.txt",
+                size_bytes=len(content),
+                created_at=now,
+                modified_at=now,
+            ),
+            location=location,
+            created_by=Creator(name="tester"),
+        )
+    )
+
+
+@pytest.fixture
+def other(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("other")
+    return Location(provider="local", config=LocalStoreConfig(directory=directory))
+
+
+def export(client) -> bytes:
+    response = client.get("/files/export/")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-tar"
+    return response.content
+
+
+def import_(client, archive: bytes, **kwargs):
+    return client.post(
+        "/files/import/",
+        files={"archive": ("files.tar", archive, "application/x-tar")},
+        **kwargs,
+    )
+
+
+def test_import_to_location_form_field(client, local_location, other):
+    store_file(b"archived", local_location)
+    archive = export(client)
+
+    response = import_(
+        client, archive, data={"location": json.dumps(other.model_dump(mode="json"))}
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"imported": 1, "skipped": 0}
+    files = client.get("/files/", params={"return_blob": False}).json()
+    assert sorted(f["location"]["config"]["directory"] for f in files) == sorted(
+        [str(local_location.config.directory), str(other.config.directory)]
+    )
+
+
+def test_import_ignores_location_in_query_string(client, local_location, other):
+    store_file(b"archived", local_location)
+    archive = export(client)
+
+    # credentials never belong in the URL, only the form field is read
+    response = import_(
+        client,
+        archive,
+        params={"location": json.dumps(other.model_dump(mode="json"))},
+    )
+
+    assert response.json() == {"imported": 0, "skipped": 1}
+
+
+def test_import_of_invalid_archive_is_400(client):
+    response = import_(client, b"not a tar archive")
+    assert response.status_code == 400
+
+
+def test_import_of_invalid_line_is_400(client):
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode="w") as tar:
+        data = b'{"metadata": {}}\n'
+        info = tarfile.TarInfo("files.ndjson")
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+
+    response = import_(client, archive.getvalue())
+
+    assert response.status_code == 400
+    assert "line 1" in response.json()["detail"]
@@ -0,0 +1,38 @@
+import pytest
+from frieles import instrumentation
+
+from frieles_api.settings import get_settings
+
+
+@pytest.fixture
+def metrics_client(client, monkeypatch):
+    monkeypatch.setenv("METRICS_ENABLED", "true")
+    get_settings.cache_clear()
+    instrumentation.metrics.reset()
+    instrumentation.add_hook(instrumentation.metrics)
+    yield client
+    instrumentation.remove_hook(instrumentation.metrics)
+    instrumentation.metrics.reset()
+    get_settings.cache_clear()
+
+
+def test_metrics_are_disabled_by_settings(client):
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_render_observed_operations(metrics_client):
+    assert metrics_client.get("/stats/").status_code == 200
+    assert (
+        metrics_client.get("/files/missing-ref/?return_blob=false").status_code == 404
+    )
+
+    response = metrics_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    usage = 'operation="store.usage",provider="any"'
+    read_one = 'operation="store.read_one",provider="any"'
+    assert f"frieles_operation_duration_seconds_count{{{usage}}} 1" in lines
+    assert f"frieles_operation_errors_total{{{usage}}} 0" in lines
+    assert f"frieles_operation_errors_total{{{read_one}}} 1" in lines
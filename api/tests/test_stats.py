@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+
+from frieles import Store
+from frieles.schemas import Blob, BlobbedFile, Creator, Location, Metadata
+
+
+def store_file(content: bytes, location: Location, mimetype: str) -> None:
+    now = datetime.now(tz=timezone.utc)
+    Store.create_one(
+        BlobbedFile[Creator](
+            blob=Blob(content=content),
+            metadata=Metadata(
+                mimetype=mimetype,
+                path="/stats/file",
+                size_bytes=len(content),
+                created_at=now,
+                modified_at=now,
+            ),
+            location=location,
+            created_by=Creator(name="tester"),
+        )
+    )
+
+
+def test_stats_groups_usage(client, local_location, s3_location):
+    store_file(b"abc", local_location, "text/plain")
+    store_file(b"defgh", local_location, "application/json")
+    store_file(b"ij", s3_location, "text/plain")
+
+    response = client.get("/stats/", params={"group_by": "provider"})
+    assert response.status_code == 200
+    assert response.json() == [
+        {"provider": "local", "count": 2, "size_bytes": 8},
+        {"provider": "s3", "count": 1, "size_bytes": 2},
+    ]
+
+    response = client.get("/stats/", params={"group_by": ["mimetype", "provider"]})
+    assert response.json() == [
+        {
+            "mimetype": "application/json",
+            "provider": "local",
+            "count": 1,
+            "size_bytes": 5,
+        },
+        {"mimetype": "text/plain", "provider": "local", "count": 1, "size_bytes": 3},
+        {"mimetype": "text/plain", "provider": "s3", "count": 1, "size_bytes": 2},
+    ]
+
+
+def test_stats_defaults_to_every_key(client, local_location):
+    store_file(b"abc", local_location, "text/plain")
+
+    response = client.get("/stats/")
+
+    assert response.json() == [
+        {
+            "provider": "local",
+            "created_by": {"name": "tester"},
+            "mimetype": "text/plain",
+            "count": 1,
+            "size_bytes": 3,
+        }
+    ]
+
+
+def test_stats_rejects_unknown_keys(client):
+    response = client.get("/stats/", params={"group_by": "path"})
+
+    assert response.status_code == 422
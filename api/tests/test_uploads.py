@@ -0,0 +1,186 @@
+import os
+from datetime import datetime, timezone
+
+import boto3
+import pytest
+import requests
+from frieles import Store
+from frieles.schemas import Blob, BlobbedFile, Location, Metadata
+from redbaby.hashing import get_hash
+
+from frieles_api.app.schemas import Creator
+
+# S3 rejects multipart parts smaller than this, except the last one
+PART_SIZE = 5 * 1024 * 1024
+
+
+def metadata(content: bytes) -> dict:
+    now = datetime.now(tz=timezone.utc).isoformat()
+    return dict(
+        mimetype="application/octet-stream",
+        path="/uploads/blob.bin",
+        size_bytes=len(content),
+        created_at=now,
+        modified_at=now,
+    )
+
+
+def uploaded_file(content: bytes, location: Location) -> dict:
+    return dict(
+        blob_ref=get_hash(str(content)),
+        metadata=metadata(content),
+        location=location.model_dump(mode="json"),
+        created_by={"name": "tester"},
+        search_tags={"origin": "upload"},
+    )
+
+
+def store_file(content: bytes, location: Location) -> None:
+    Store.create_one(
+        BlobbedFile[Creator](
+            blob=Blob(content=content),
+            metadata=Metadata(**metadata(content)),
+            location=location,
+            created_by=Creator(name="tester"),
+        )
+    )
+
+
+def bucket_keys(location: Location) -> list[str]:
+    s3 = boto3.client("s3", region_name=location.config.region)
+    listing = s3.list_objects_v2(Bucket=location.config.bucket_name)
+    return [obj["Key"] for obj in listing.get("Contents", [])]
+
+
+def presign(client, content: bytes, location: Location, parts: int = 1) -> dict:
+    response = client.post(
+        "/files/uploads/",
+        json=dict(
+            blob_ref=get_hash(str(content)),
+            location=location.model_dump(mode="json"),
+            parts=parts,
+        ),
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_download_redirects_to_presigned_url(client, s3_location):
+    content = b"presigned download"
+    store_file(content, s3_location)
+    blob_ref = get_hash(str(content))
+
+    response = client.get(f"/files/{blob_ref}/download/", follow_redirects=False)
+    assert response.status_code == 307
+    url = response.headers["location"]
+    assert blob_ref in url
+    assert requests.get(url).content == content
+
+    response = client.get(f"/files/{blob_ref}/download/", params={"redirect": False})
+    assert response.status_code == 200
+    assert requests.get(response.json()["url"]).content == content
+
+
+def test_download_of_missing_file_is_404(client, s3_location):
+    response = client.get("/files/missing/download/", follow_redirects=False)
+    assert response.status_code == 404
+
+
+def test_single_put_upload(client, s3_location):
+    content = b"uploaded with a single PUT"
+    upload = presign(client, content, s3_location)
+    assert len(upload["urls"]) == 1
+    assert upload["upload_id"] is None
+
+    requests.put(upload["urls"][0], data=content).raise_for_status()
+    response = client.post(
+        "/files/uploads/complete/",
+        json=dict(file=uploaded_file(content, s3_location), key=upload["key"]),
+    )
+    assert response.status_code == 201, response.text
+
+    blob_ref = upload["blob_ref"]
+    file = client.get(f"/files/{blob_ref}/", params={"return_blob": False}).json()
+    assert file["metadata"]["size_bytes"] == len(content)
+    assert file["created_by"] == {"name": "tester"}
+    assert Store.read_one(blob_ref, return_blob=True).blob.content == content
+    # the staging object is moved to the blob reference
+    assert bucket_keys(s3_location) == [blob_ref]
+
+
+def test_multipart_upload(client, s3_location):
+    content = os.urandom(PART_SIZE) + b"last part"
+    upload = presign(client, content, s3_location, parts=2)
+    assert len(upload["urls"]) == 2
+    assert upload["upload_id"] is not None
+
+    parts = []
+    for number, (url, start) in enumerate(zip(upload["urls"], (0, PART_SIZE)), 1):
+        response = requests.put(url, data=content[start : start + PART_SIZE])
+        response.raise_for_status()
+        parts.append(dict(part_number=number, etag=response.headers["ETag"]))
+
+    response = client.post(
+        "/files/uploads/complete/",
+        json=dict(
+            file=uploaded_file(content, s3_location),
+            key=upload["key"],
+            upload_id=upload["upload_id"],
+            parts=parts,
+        ),
+    )
+    assert response.status_code == 201, response.text
+    assert Store.read_one(upload["blob_ref"], return_blob=True).blob.content == content
+
+
+def test_complete_without_upload_is_404(client, s3_location):
+    content = b"never uploaded"
+    upload = presign(client, content, s3_location)
+
+    response = client.post(
+        "/files/uploads/complete/",
+        json=dict(file=uploaded_file(content, s3_location), key=upload["key"]),
+    )
+    assert response.status_code == 404
+    with pytest.raises(Exception):
+        Store.read_one(upload["blob_ref"])
+
+
+def test_complete_rejects_content_not_matching_blob_ref(client, s3_location):
+    content = b"expected content"
+    upload = presign(client, content, s3_location)
+    requests.put(upload["urls"][0], data=b"other content").raise_for_status()
+
+    response = client.post(
+        "/files/uploads/complete/",
+        json=dict(file=uploaded_file(content, s3_location), key=upload["key"]),
+    )
+    assert response.status_code == 400
+    assert bucket_keys(s3_location) == []
+
+
+def test_complete_rejects_keys_outside_staging(client, s3_location):
+    content = b"stored content"
+    store_file(content, s3_location)
+    blob_ref = get_hash(str(content))
+
+    response = client.post(
+        "/files/uploads/complete/",
+        json=dict(file=uploaded_file(content, s3_location), key=blob_ref),
+    )
+    assert response.status_code == 400
+    assert bucket_keys(s3_location) == [blob_ref]
+
+
+def test_presign_refuses_existing_blob(client, s3_location):
+    content = b"already stored"
+    store_file(content, s3_location)
+
+    response = client.post(
+        "/files/uploads/",
+        json=dict(
+            blob_ref=get_hash(str(content)),
+            location=s3_location.model_dump(mode="json"),
+        ),
+    )
+    assert response.status_code == 409
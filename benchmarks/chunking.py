@@ -0,0 +1,121 @@
+"""
+Storage savings and ingest throughput of chunked storage on versioned data.
+
+A random base document is edited into successive versions (small inserts,
+deletes and overwrites), and every version is ingested both as whole blobs
+and as content-defined chunks:
+
+    python benchmarks/chunking.py --size 4194304 --versions 20 --edits 8
+"""
+
+import argparse
+import json
+import random
+import time
+
+# standins sets up the environment frieles reads on import
+from standins import PROVIDERS, make_file, provider_location, setup_metadata_db
+
+# isort: split
+
+from frieles import Store
+from frieles.chunking import chunk
+from frieles.schemas import Chunk, Location
+
+
+def versions(size: int, count: int, edits: int, seed: int) -> list[bytes]:
+    rng = random.Random(seed)
+    current = bytearray(rng.randbytes(size))
+    dataset = [bytes(current)]
+    for _ in range(count - 1):
+        for _ in range(edits):
+            offset = rng.randrange(len(current))
+            span = rng.randrange(1, 256)
+            kind = rng.choice(("insert", "delete", "overwrite"))
+            if kind == "insert":
+                current[offset:offset] = rng.randbytes(span)
+            elif kind == "delete":
+                del current[offset : offset + span]
+            else:
+                current[offset : offset + span] = rng.randbytes(span)
+        dataset.append(bytes(current))
+    return dataset
+
+
+def ingest(location: Location, dataset: list[bytes], chunked: bool) -> dict:
+    run = f"{'chunked' if chunked else 'whole'}-{location.provider}"
+    files = [make_file(location, c, f"v{i}.bin", run) for i, c in enumerate(dataset)]
+
+    start = time.perf_counter()
+    for file in files:
+        Store.create_one(file, chunked=chunked)
+    seconds = time.perf_counter() - start
+
+    logical = sum(len(c) for c in dataset)
+    if chunked:
+        stored = sum(
+            c["size_bytes"]
+            for c in Chunk.collection().find(
+                {"location.provider": location.provider}, {"size_bytes": 1}
+            )
+        )
+    else:
+        stored = logical
+
+    Store.delete(search_tags={"run": run})
+    return dict(
+        mode="chunked" if chunked else "whole",
+        logical_bytes=logical,
+        stored_bytes=stored,
+        savings=1 - stored / logical,
+        seconds=seconds,
+        ingest_bytes_per_second=logical / seconds,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1024 * 1024)
+    parser.add_argument("--versions", type=int, default=10)
+    parser.add_argument("--edits", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--provider", choices=PROVIDERS, default="local")
+    parser.add_argument("--uri", default=None, help="Use a MongoDB server.")
+    parser.add_argument("-o", "--output", default=None, help="Defaults to stdout.")
+    args = parser.parse_args()
+
+    dataset = versions(args.size, args.versions, args.edits, args.seed)
+
+    start = time.perf_counter()
+    nchunks = sum(1 for content in dataset for _ in chunk(content))
+    seconds = time.perf_counter() - start
+    chunker = dict(
+        chunks=nchunks,
+        avg_chunk_bytes=sum(map(len, dataset)) / nchunks,
+        bytes_per_second=sum(map(len, dataset)) / seconds,
+    )
+
+    setup_metadata_db(args.uri)
+    with provider_location(args.provider, args.uri) as location:
+        results = [ingest(location, dataset, chunked) for chunked in (False, True)]
+
+    report = dict(
+        params=dict(
+            size=args.size,
+            versions=args.versions,
+            edits=args.edits,
+            seed=args.seed,
+            provider=args.provider,
+        ),
+        chunker=chunker,
+        results=results,
+    )
+    if args.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
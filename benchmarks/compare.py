@@ -0,0 +1,60 @@
+"""
+Compare two JSON reports written by `benchmarks/suite.py`.
+
+    python benchmarks/compare.py baseline.json candidate.json
+"""
+
+import argparse
+import json
+
+
+def load(path: str) -> dict[tuple, dict]:
+    with open(path) as f:
+        report = json.load(f)
+
+    return {
+        (r["provider"], r["target"], r["operation"], r["blob_size"], r["count"]): r
+        for r in report["results"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.9,
+        help="Flag candidate/baseline throughput ratios below this value.",
+    )
+    args = parser.parse_args()
+
+    baseline = load(args.baseline)
+    candidate = load(args.candidate)
+
+    regressions = 0
+    for key in sorted(baseline.keys() & candidate.keys(), key=str):
+        before = baseline[key]["ops_per_second"]
+        after = candidate[key]["ops_per_second"]
+        if not before or not after:
+            continue
+
+        ratio = after / before
+        flag = ""
+        if ratio < args.threshold:
+            flag = "  <-- regression"
+            regressions += 1
+
+        provider, target, operation, size, count = key
+        print(
+            f"{provider:>8} {target:>5} {operation:<28} size={size:<9} "
+            f"count={count:<6} {before:>12,.1f} -> {after:>12,.1f} ops/s "
+            f"({ratio:.2f}x){flag}"
+        )
+
+    raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Check import and cold start times against a budget.
+
+Each module is imported in a fresh interpreter and its cumulative
+`python -X importtime` time is compared to its budget. `create_app` is timed
+the way uvicorn starts the API, importing and building the application in a
+fresh interpreter. The best run counts, and the script exits non-zero when a
+budget is exceeded or a target pulls in a dependency it should load lazily:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget frieles=10 --repeat 10
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# budgets in milliseconds
+DEFAULT_BUDGETS = {
+    "frieles": 10.0,
+    "frieles_api": 10.0,
+    "frieles_api.settings": 250.0,
+    "frieles.store": 500.0,
+    "create_app": 1500.0,
+}
+
+# targets timed as code rather than as a module import
+STATEMENTS = {
+    # what `python -m frieles_api` has uvicorn run on start
+    "create_app": "from frieles_api import create_app; create_app()",
+}
+
+# modules that must not be loaded as a side effect of running the target
+FORBIDDEN = {
+    "frieles": ("pydantic", "pymongo", "redbaby", "boto3"),
+    "frieles_api": ("fastapi", "pymongo", "redbaby", "boto3"),
+    "frieles_api.settings": ("fastapi", "pymongo", "redbaby", "boto3"),
+    "frieles.store": ("boto3",),
+    "create_app": ("boto3",),
+}
+
+
+def import_time(module: str, env: dict[str, str]) -> float:
+    """Cumulative import time of `module` in milliseconds."""
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def statement_time(statement: str, env: dict[str, str]) -> float:
+    """Wall time of running `statement` in a fresh interpreter, in milliseconds."""
+
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"{statement}; "
+        "print((time.perf_counter() - start) * 1000)"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return float(proc.stdout.split()[-1])
+
+
+def code_for(target: str) -> str:
+    return STATEMENTS.get(target, f"import {target}")
+
+
+def loaded(target: str, candidates: tuple[str, ...], env: dict[str, str]) -> list[str]:
+    code = (
+        f"import sys; {code_for(target)}; "
+        f"print(*[m for m in {candidates!r} if m in sys.modules])"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return proc.stdout.split()
+
+
+def parse_budget(value: str) -> tuple[str, float]:
+    module, _, budget = value.partition("=")
+    return module, float(budget)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--budget",
+        action="append",
+        type=parse_budget,
+        default=[],
+        metavar="MODULE=MS",
+        help="Override or add a module budget in milliseconds.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    budgets = {**DEFAULT_BUDGETS, **dict(args.budget)}
+
+    # no .env is needed to import the packages, make sure none is picked up
+    import_env = {k: v for k, v in os.environ.items() if k not in ("DB_URI", "DB_NAME")}
+    # building the app reads the settings; MongoClient connects lazily, so no
+    # server is needed
+    app_env = {
+        "DB_URI": "mongodb://localhost:27017",
+        "DB_NAME": "frieles-import-time",
+        **os.environ,
+    }
+
+    failures = 0
+    for target, budget in budgets.items():
+        env = app_env if target in STATEMENTS else import_env
+        try:
+            if target in STATEMENTS:
+                best = min(
+                    statement_time(STATEMENTS[target], env) for _ in range(args.repeat)
+                )
+            else:
+                best = min(import_time(target, env) for _ in range(args.repeat))
+        except subprocess.CalledProcessError as e:
+            error = e.stderr.strip().splitlines()[-1] if e.stderr.strip() else ""
+            print(f"{target:<22} FAILED  {error}")
+            failures += 1
+            continue
+
+        status = "ok" if best <= budget else "OVER BUDGET"
+        print(f"{target:<22} {best:>9.1f} ms  (budget {budget:.1f} ms)  {status}")
+        if best > budget:
+            failures += 1
+
+        eager = loaded(target, FORBIDDEN.get(target, ()), env)
+        if eager:
+            print(f"{'':<22} eagerly imports {', '.join(eager)}")
+            failures += 1
+
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
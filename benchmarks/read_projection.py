@@ -0,0 +1,95 @@
+"""
+Rows per second for full, projected and raw `Store.read` listings.
+
+By default the files collection lives in an in-memory mongomock client, pass
+`--uri` to run against a real MongoDB server instead:
+
+    python benchmarks/read_projection.py --rows 20000
+    python benchmarks/read_projection.py --uri mongodb://localhost:27017
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone
+
+# standins sets up the environment frieles reads on import
+from standins import setup_metadata_db
+
+# isort: split
+
+from bson import ObjectId
+from frieles import Store
+from frieles.schemas import File
+from redbaby.hashing import get_hash
+
+VARIANTS = {
+    "full": dict(),
+    "projected": dict(fields=["blob_ref", "metadata.path", "metadata.size_bytes"]),
+    "raw": dict(raw=True),
+}
+
+
+def seed(rows: int, tags: int) -> None:
+    now = datetime.now(tz=timezone.utc)
+    docs = []
+    for i in range(rows):
+        docs.append(
+            {
+                "_id": ObjectId(),
+                "metadata": {
+                    "mimetype": "text/plain",
+                    "path": f"/bench/{i}.txt",
+                    "size_bytes": i,
+                    "created_at": now,
+                    "modified_at": now,
+                    "extras": None,
+                },
+                "location": {
+                    "provider": "local",
+                    "config": {"directory": "/tmp"},
+                },
+                "blob_ref": get_hash(str(i)),
+                "created_by": {"name": "bench", "email": "bench@example.com"},
+                "search_tags": {f"tag_{t}": f"value_{i}_{t}" for t in range(tags)},
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+    File.collection().insert_many(docs)
+
+
+def run(rows: int, repeat: int) -> dict[str, float]:
+    results = {}
+    for name, kwargs in VARIANTS.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            count = sum(1 for _ in Store.read(filters={}, **kwargs))
+            best = min(best, time.perf_counter() - start)
+        assert count == rows, f"{name} returned {count} rows, expected {rows}"
+        results[name] = rows / best
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--tags", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--uri", default=None)
+    args = parser.parse_args()
+
+    setup_metadata_db(args.uri)
+    seed(args.rows, args.tags)
+    results = run(args.rows, args.repeat)
+
+    baseline = results["full"]
+    for name, rows_per_second in results.items():
+        print(
+            f"{name:>10}: {rows_per_second:>12,.0f} rows/s "
+            f"({rows_per_second / baseline:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Local stand-ins for the metadata database and every blob provider.
+
+Import this module before `frieles` so the settings it needs are in place.
+"""
+
+import contextlib
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+os.environ.setdefault("DB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "frieles-bench")
+os.environ.setdefault("METRICS_ENABLED", "false")
+
+from frieles.schemas import (  # noqa: E402
+    Blob,
+    BlobbedFile,
+    Chunk,
+    ChunkManifest,
+    Creator,
+    File,
+    LocalStoreConfig,
+    Location,
+    Metadata,
+    MongoStoreConfig,
+    S3StoreConfig,
+    Usage,
+)
+from redbaby.database import DB  # noqa: E402
+
+PROVIDERS = ("local", "mongodb", "s3")
+
+S3_BUCKET = "frieles-bench"
+S3_REGION = "us-east-1"
+
+
+def make_file(location: Location, content: bytes, name: str, run: str) -> BlobbedFile:
+    """
+    A benchmark file stored as `/bench/<run>/<name>` and tagged with its run,
+    so a run can be cleaned up with `Store.delete(search_tags={"run": run})`.
+    """
+
+    now = datetime.now(tz=timezone.utc)
+    return BlobbedFile(
+        blob=Blob(content=content),
+        metadata=Metadata(
+            mimetype="application/octet-stream",
+            path=f"/bench/{run}/{name}",
+            size_bytes=len(content),
+            created_at=now,
+            modified_at=now,
+        ),
+        location=location,
+        created_by=Creator(name="bench"),
+        search_tags={"run": run},
+    )
+
+
+def _client(uri: str | None):
+    if uri is None:
+        import mongomock
+
+        return mongomock.MongoClient()
+
+    from pymongo import MongoClient
+
+    return MongoClient(host=uri)
+
+
+def setup_metadata_db(uri: str | None = None) -> None:
+    """
+    Point the default connection at mongomock, or at a real server when
+    `uri` is given, and start from empty collections.
+    """
+
+    DB.add_conn(
+        db_name=os.environ["DB_NAME"],
+        uri=uri or "mongomock://",
+        start_client=False,
+    )
+    DB.clients["default"] = _client(uri)
+    for document in (File, Chunk, ChunkManifest, Usage):
+        document.collection().drop()
+
+
+@contextlib.contextmanager
+def local_location() -> Iterator[Location]:
+    with tempfile.TemporaryDirectory(prefix="frieles-bench-") as directory:
+        yield Location(
+            provider="local",
+            config=LocalStoreConfig(directory=Path(directory)),
+        )
+
+
+@contextlib.contextmanager
+def mongo_location(uri: str | None = None) -> Iterator[Location]:
+    alias = uri or "mongomock://blobs"
+    DB.add_conn(
+        db_name=os.environ["DB_NAME"], uri=alias, alias=alias, start_client=False
+    )
+    DB.clients[alias] = _client(uri)
+    DB.get(alias=alias)["blobs"].drop()
+    try:
+        yield Location(provider="mongodb", config=MongoStoreConfig(database_uri=alias))
+    finally:
+        DB.get(alias=alias)["blobs"].drop()
+
+
+@contextlib.contextmanager
+def s3_location() -> Iterator[Location]:
+    import boto3
+    from moto import mock_aws
+
+    with mock_aws():
+        boto3.client("s3", region_name=S3_REGION).create_bucket(Bucket=S3_BUCKET)
+        yield Location(
+            provider="s3",
+            config=S3StoreConfig(
+                access_key_id="testing",
+                secret_access_key="testing",
+                region=S3_REGION,
+                bucket_name=S3_BUCKET,
+                addressing_style="auto",
+            ),
+        )
+
+
+def provider_location(
+    provider: str,
+    uri: str | None = None,
+) -> contextlib.AbstractContextManager[Location]:
+    if provider == "local":
+        return local_location()
+    if provider == "mongodb":
+        return mongo_location(uri)
+    if provider == "s3":
+        return s3_location()
+    raise ValueError(f"Unknown provider {provider!r}, expected one of {PROVIDERS}.")
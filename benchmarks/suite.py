@@ -0,0 +1,204 @@
+"""
+Benchmark `Store` operations and API routes across every provider.
+
+Providers run against local stand-ins (a temporary directory, mongomock or a
+local mongod, moto for S3) and the results are written as JSON so runs from
+different versions can be compared with `benchmarks/compare.py`:
+
+    python benchmarks/suite.py --sizes 1024 1048576 --counts 10 100 -o run.json
+"""
+
+import argparse
+import base64
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Any, Callable
+
+# standins sets up the environment frieles reads on import
+from standins import PROVIDERS, make_file, provider_location, setup_metadata_db
+
+# isort: split
+
+from frieles import Store
+from frieles.schemas import BlobbedFile, Location
+
+
+def bench_file(location: Location, index: int, size: int, run: str) -> BlobbedFile:
+    # the API carries blobs as UTF-8 JSON strings, so keep the content ASCII
+    prefix = f"{run}/{index}:".encode()
+    content = prefix + base64.b64encode(os.urandom(size))[: max(size - len(prefix), 0)]
+    return make_file(location, content, f"{index}.bin", run)
+
+
+def timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def result(
+    provider: str,
+    target: str,
+    operation: str,
+    size: int,
+    count: int,
+    seconds: float,
+    transferred: int = 0,
+) -> dict[str, Any]:
+    return dict(
+        provider=provider,
+        target=target,
+        operation=operation,
+        blob_size=size,
+        count=count,
+        seconds=seconds,
+        ops_per_second=count / seconds if seconds else None,
+        bytes_per_second=transferred / seconds if seconds and transferred else None,
+    )
+
+
+def bench_store(provider: str, location: Location, size: int, count: int):
+    run = f"store-{provider}-{size}-{count}"
+    files = [bench_file(location, i, size, run) for i in range(count)]
+    filters = {"search_tags.run": run}
+    total = size * count
+
+    seconds = timed(lambda: [Store.create_one(file) for file in files])
+    yield result(provider, "store", "create_one", size, count, seconds, total)
+
+    seconds = timed(lambda: list(Store.read(filters=filters)))
+    yield result(provider, "store", "read", size, count, seconds)
+
+    seconds = timed(lambda: list(Store.read(return_blob=True, filters=filters)))
+    yield result(provider, "store", "read_blobs", size, count, seconds, total)
+
+    blob_refs = [f.blob_ref for f in Store.read(filters=filters, fields=["blob_ref"])]
+    seconds = timed(
+        lambda: [Store.read_one(ref, return_blob=True) for ref in blob_refs]
+    )
+    yield result(provider, "store", "read_one", size, count, seconds, total)
+
+    seconds = timed(lambda: Store.delete(search_tags={"run": run}))
+    yield result(provider, "store", "delete", size, count, seconds)
+
+
+def bench_api(client, provider: str, location: Location, size: int, count: int):
+    run = f"api-{provider}-{size}-{count}"
+    bodies = [
+        bench_file(location, i, size, run).model_dump(mode="json") for i in range(count)
+    ]
+    params = {"search_tags": json.dumps({"key": "run", "value": run})}
+    total = size * count
+
+    def post():
+        for body in bodies:
+            client.post("/files/", json=body).raise_for_status()
+
+    seconds = timed(post)
+    yield result(provider, "api", "POST /files/", size, count, seconds, total)
+
+    seconds = timed(lambda: client.get("/files/", params=params).raise_for_status())
+    yield result(provider, "api", "GET /files/", size, count, seconds)
+
+    blob_refs = [
+        f.blob_ref
+        for f in Store.read(filters={"search_tags.run": run}, fields=["blob_ref"])
+    ]
+
+    def get_one():
+        for ref in blob_refs:
+            client.get(
+                f"/files/{ref}/", params={"return_blob": True}
+            ).raise_for_status()
+
+    seconds = timed(get_one)
+    yield result(provider, "api", "GET /files/{blob_ref}/", size, count, seconds, total)
+
+    def delete_one():
+        for ref in blob_refs:
+            client.delete(f"/files/{ref}/").raise_for_status()
+
+    seconds = timed(delete_one)
+    yield result(provider, "api", "DELETE /files/{blob_ref}/", size, count, seconds)
+
+
+def environment(args: argparse.Namespace) -> dict[str, Any]:
+    try:
+        version = metadata.version("frieles")
+    except metadata.PackageNotFoundError:
+        version = None
+
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+
+    return dict(
+        timestamp=datetime.now(tz=timezone.utc).isoformat(),
+        python=sys.version,
+        platform=platform.platform(),
+        frieles_version=version,
+        git_revision=revision,
+        params=dict(
+            providers=args.providers,
+            sizes=args.sizes,
+            counts=args.counts,
+            api=not args.no_api,
+            mongo_uri=args.uri,
+        ),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--providers", nargs="+", choices=PROVIDERS, default=PROVIDERS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1024, 1024 * 1024])
+    parser.add_argument("--counts", nargs="+", type=int, default=[10, 100])
+    parser.add_argument("--uri", default=None, help="Use a MongoDB server.")
+    parser.add_argument("--no-api", action="store_true", help="Skip API routes.")
+    parser.add_argument("-o", "--output", default=None, help="Defaults to stdout.")
+    args = parser.parse_args()
+
+    client = None
+    if not args.no_api:
+        from fastapi.testclient import TestClient
+        from frieles_api import create_app
+
+        client = TestClient(create_app())
+
+    # after create_app, which connects the default alias to DB_URI
+    setup_metadata_db(args.uri)
+
+    results = []
+    for provider in args.providers:
+        with provider_location(provider, args.uri) as location:
+            for size in args.sizes:
+                for count in args.counts:
+                    results.extend(bench_store(provider, location, size, count))
+                    if client is not None:
+                        results.extend(
+                            bench_api(client, provider, location, size, count)
+                        )
+
+    report = dict(environment=environment(args), results=results)
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,30 @@
-from .store import Store
-from .utils import setup_database
+import importlib
+
+# a local flag rather than `typing.TYPE_CHECKING`: importing typing costs
+# more than the rest of the package; type checkers treat both the same
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from .store import Store
+    from .utils import setup_database
+
+# Resolved on first access so `import frieles` does not pull in
+# pydantic, pymongo and redbaby until the store is actually used.
+_LAZY_ATTRIBUTES = {
+    "Store": ".store",
+    "setup_database": ".utils",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
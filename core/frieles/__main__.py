@@ -0,0 +1,87 @@
+import argparse
+import json
+import sys
+
+from .errors import InvalidSettingsError
+
+
+def export_command(args: argparse.Namespace) -> None:
+    from .archive import export_archive
+
+    filters = json.loads(args.filters) if args.filters else None
+    if args.output == "-":
+        export_archive(sys.stdout.buffer, filters=filters, workers=args.workers)
+        return
+
+    with open(args.output, "wb") as f:
+        export_archive(f, filters=filters, workers=args.workers)
+
+
+def import_command(args: argparse.Namespace) -> None:
+    from .archive import import_archive
+    from .schemas import Location
+
+    location = Location.model_validate_json(args.location) if args.location else None
+    kwargs = dict(location=location, batch_size=args.batch_size, workers=args.workers)
+    if args.input == "-":
+        summary = import_archive(sys.stdin.buffer, **kwargs)
+    else:
+        with open(args.input, "rb") as f:
+            summary = import_archive(f, **kwargs)
+
+    print(summary.model_dump_json(), file=sys.stderr)
+
+
+def reconcile_usage_command(args: argparse.Namespace) -> None:
+    from .usage import rebuild_usage
+
+    print(f"Rebuilt {rebuild_usage()} usage counters.", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="frieles")
+    subparsers = parser.add_subparsers(required=True)
+
+    export_parser = subparsers.add_parser(
+        "export", help="Export files and blobs as a tar archive."
+    )
+    export_parser.add_argument(
+        "-o", "--output", default="-", help="Defaults to stdout."
+    )
+    export_parser.add_argument("--filters", help="MongoDB filters as JSON.")
+    export_parser.add_argument("--workers", type=int, default=8)
+    export_parser.set_defaults(command=export_command)
+
+    import_parser = subparsers.add_parser(
+        "import", help="Import files and blobs from a tar archive."
+    )
+    import_parser.add_argument(
+        "input", nargs="?", default="-", help="Defaults to stdin."
+    )
+    import_parser.add_argument(
+        "--location", help="Store every blob in this location, as JSON."
+    )
+    import_parser.add_argument("--batch-size", type=int, default=100)
+    import_parser.add_argument("--workers", type=int, default=8)
+    import_parser.set_defaults(command=import_command)
+
+    reconcile_parser = subparsers.add_parser(
+        "reconcile-usage", help="Rebuild the usage counters from the files."
+    )
+    reconcile_parser.set_defaults(command=reconcile_usage_command)
+
+    args = parser.parse_args()
+
+    from .utils import setup_database
+
+    try:
+        setup_database()
+    except InvalidSettingsError as e:
+        print(e, file=sys.stderr)
+        exit(-1)
+
+    args.command(args)
+
+
+if __name__ == "__main__":
+    main()
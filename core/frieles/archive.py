@@ -0,0 +1,248 @@
+"""
+Streaming export and import of files and blobs as tar archives.
+
+An archive holds every `File` document as a line of `files.ndjson` (MongoDB
+extended JSON, so ids and dates round-trip) followed by one `blobs/<blob_ref>`
+entry per file, in the same order. Both directions keep a bounded number of
+blobs in memory; the metadata is spooled to disk once it outgrows memory.
+"""
+
+import io
+import shutil
+import tarfile
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Iterator
+
+from bson import ObjectId, json_util
+from pydantic import ValidationError
+
+from .instrumentation import instrumented, observe
+from .schemas import ArchiveImport, Blob, Creator, File, Location
+from .store import _find_file_blob, insert_blobs
+from .usage import record_usage
+
+METADATA_NAME = "files.ndjson"
+BLOB_PREFIX = "blobs/"
+
+# metadata kept in memory before the spool rolls over to a temporary file
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+_JSON_OPTIONS = json_util.RELAXED_JSON_OPTIONS
+
+
+class _Buffer:
+    """Write-only file object drained after every archive member."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _tarinfo(name: str, size: int, mtime: float) -> tarfile.TarInfo:
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = int(mtime)
+    return info
+
+
+def _spool_metadata(filters: dict[str, Any] | None) -> IO[bytes]:
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    with observe("metadata.find"):
+        for doc in File.find(filter=filters, lazy=True):
+            spool.write(json_util.dumps(doc, json_options=_JSON_OPTIONS).encode())
+            spool.write(b"\n")
+    return spool
+
+
+def _iter_documents(spool: IO[bytes]) -> Iterator[dict[str, Any]]:
+    spool.seek(0)
+    for line in spool:
+        yield json_util.loads(line, json_options=_JSON_OPTIONS)
+
+
+def iter_export(
+    filters: dict[str, Any] | None = None,
+    workers: int = 8,
+) -> Iterator[bytes]:
+    """
+    Export files and their blobs as a streamed tar archive.
+
+    :param filters: A dictionary of filters selecting the files to export.
+    :param workers: The number of blobs read concurrently.
+    :return: An iterator over the archive bytes.
+    """
+
+    mtime = time.time()
+    buffer = _Buffer()
+    spool = _spool_metadata(filters)
+
+    with spool, ThreadPoolExecutor(max_workers=workers) as pool:
+        tar = tarfile.open(fileobj=buffer, mode="w|")
+
+        size = spool.tell()
+        spool.seek(0)
+        tar.addfile(_tarinfo(METADATA_NAME, size, mtime), spool)
+        yield buffer.drain()
+
+        # read ahead at most `2 * workers` blobs, written in metadata order
+        pending = deque()
+        documents = _iter_documents(spool)
+        for doc in documents:
+            pending.append((doc["blob_ref"], pool.submit(_find_file_blob, doc)))
+            if len(pending) < 2 * workers:
+                continue
+
+            blob_ref, future = pending.popleft()
+            _add_blob(tar, blob_ref, future.result(), mtime)
+            yield buffer.drain()
+
+        while pending:
+            blob_ref, future = pending.popleft()
+            _add_blob(tar, blob_ref, future.result(), mtime)
+            yield buffer.drain()
+
+        tar.close()
+        yield buffer.drain()
+
+
+def _add_blob(tar: tarfile.TarFile, blob_ref: str, blob: Blob, mtime: float) -> None:
+    info = _tarinfo(f"{BLOB_PREFIX}{blob_ref}", len(blob.content), mtime)
+    tar.addfile(info, io.BytesIO(blob.content))
+
+
+def export_archive(
+    fileobj: IO[bytes],
+    filters: dict[str, Any] | None = None,
+    workers: int = 8,
+) -> None:
+    """
+    Export files and their blobs as a tar archive written to `fileobj`.
+
+    :param fileobj: A writable binary file object.
+    :param filters: A dictionary of filters selecting the files to export.
+    :param workers: The number of blobs read concurrently.
+    """
+
+    with observe("archive.export"):
+        for data in iter_export(filters, workers):
+            fileobj.write(data)
+
+
+@instrumented("archive.import")
+def import_archive(
+    fileobj: IO[bytes],
+    location: Location | None = None,
+    batch_size: int = 100,
+    workers: int = 8,
+) -> ArchiveImport:
+    """
+    Import an archive written by `export_archive`, skipping files whose
+    blob reference the store already has in the target location.
+
+    :param fileobj: A readable binary file object, read as a stream.
+    :param location: Store every blob in this location instead of the
+        location it was exported from.
+    :param batch_size: The number of files held in memory and inserted at once.
+    :param workers: The number of blobs written concurrently.
+    :return: The number of imported and skipped files.
+    :raises: ValueError if the archive is not in the expected layout or
+        holds an invalid file.
+    """
+
+    summary = ArchiveImport()
+    with tarfile.open(fileobj=fileobj, mode="r|*") as tar:
+        members = iter(tar)
+
+        first = next(members, None)
+        if first is None or first.name != METADATA_NAME:
+            raise ValueError(f"Archive must start with {METADATA_NAME}.")
+
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+            shutil.copyfileobj(tar.extractfile(first), spool)
+
+            batch = []
+            for line, doc in enumerate(_iter_documents(spool), start=1):
+                if location is not None:
+                    doc["location"] = location.model_dump()
+                batch.append(_validate(doc, line))
+                if len(batch) >= batch_size:
+                    _import_batch(batch, members, tar, summary, workers)
+                    batch = []
+
+            if batch:
+                _import_batch(batch, members, tar, summary, workers)
+
+    return summary
+
+
+def _validate(doc: dict[str, Any], line: int) -> dict[str, Any]:
+    # inserted as `Store.create_one` would, unknown fields are dropped
+    try:
+        file = File[Creator].model_validate(doc)
+    except ValidationError as e:
+        raise ValueError(f"Invalid file on line {line} of {METADATA_NAME}: {e}") from e
+    return file.model_dump(by_alias=True)
+
+
+def _import_batch(
+    batch: list[dict[str, Any]],
+    members: Iterator[tarfile.TarInfo],
+    tar: tarfile.TarFile,
+    summary: ArchiveImport,
+    workers: int,
+) -> None:
+    # a file only counts as present in the location it is imported to
+    refs = [doc["blob_ref"] for doc in batch]
+    ids = [doc["_id"] for doc in batch]
+    existing: dict[str, list[dict[str, Any]]] = {}
+    taken_ids = set()
+    with observe("metadata.find"):
+        for doc in File.collection().find(
+            {"$or": [{"blob_ref": {"$in": refs}}, {"_id": {"$in": ids}}]},
+            projection={"blob_ref": 1, "location": 1},
+        ):
+            existing.setdefault(doc["blob_ref"], []).append(doc["location"])
+            taken_ids.add(doc["_id"])
+
+    docs = []
+    blobs = []
+    for doc in batch:
+        member = next(members, None)
+        expected = f"{BLOB_PREFIX}{doc['blob_ref']}"
+        if member is None or member.name != expected:
+            raise ValueError(f"Expected archive entry {expected}.")
+
+        if doc["location"] in existing.get(doc["blob_ref"], ()):
+            summary.skipped += 1
+            continue
+
+        # a copy to another location of a file the store already has
+        if doc["_id"] in taken_ids:
+            doc["_id"] = ObjectId()
+
+        blob = Blob(content=tar.extractfile(member).read())
+        docs.append(doc)
+        blobs.append((blob, Location(**doc["location"]), bool(doc.get("chunked"))))
+
+    if not docs:
+        return
+
+    for doc, blob_ref in zip(docs, insert_blobs(blobs, workers)):
+        doc["blob_ref"] = blob_ref
+
+    col = File.collection()
+    with observe("metadata.insert"):
+        col.insert_many(docs, ordered=False)
+    record_usage(added=docs)
+    summary.imported += len(docs)
@@ -0,0 +1,98 @@
+"""
+Content-defined chunking with FastCDC.
+
+Cut points are picked where a rolling gear hash matches a mask, so an edit
+only changes the chunks around it and the rest of a new version deduplicates
+against the previous one. Normalized chunking uses a stricter mask before the
+average size and a looser one after it, keeping chunk sizes close to average.
+"""
+
+import hashlib
+from typing import Iterator
+
+MIN_SIZE = 2 * 1024
+AVG_SIZE = 8 * 1024
+MAX_SIZE = 64 * 1024
+
+_NORMALIZATION = 2
+_MASK_64 = (1 << 64) - 1
+
+# 64-bit pseudo-random value per byte, derived from sha256 so it is stable
+# across processes and Python versions
+GEAR = tuple(
+    int.from_bytes(hashlib.sha256(bytes([i])).digest()[:8], "big") for i in range(256)
+)
+
+
+def _mask(bits: int) -> int:
+    # the highest bits of a gear hash depend on the widest window of bytes
+    return ((1 << bits) - 1) << (64 - bits)
+
+
+def _cut_point(
+    data: bytes,
+    start: int,
+    end: int,
+    min_size: int,
+    avg_size: int,
+    max_size: int,
+    mask_s: int,
+    mask_l: int,
+) -> int:
+    size = end - start
+    if size <= min_size:
+        return end
+    if size > max_size:
+        size = max_size
+    normal = min(size, avg_size)
+
+    gear = GEAR
+    h = 0
+    i = start + min_size
+    normal_end = start + normal
+    while i < normal_end:
+        h = ((h << 1) + gear[data[i]]) & _MASK_64
+        i += 1
+        if not h & mask_s:
+            return i
+
+    size_end = start + size
+    while i < size_end:
+        h = ((h << 1) + gear[data[i]]) & _MASK_64
+        i += 1
+        if not h & mask_l:
+            return i
+
+    return size_end
+
+
+def chunk(
+    data: bytes,
+    min_size: int = MIN_SIZE,
+    avg_size: int = AVG_SIZE,
+    max_size: int = MAX_SIZE,
+) -> Iterator[bytes]:
+    """
+    Split data into content-defined chunks.
+
+    :param data: The content to split.
+    :param min_size: The minimum chunk size, except for the last chunk.
+    :param avg_size: The expected chunk size, rounded down to a power of two.
+    :param max_size: The maximum chunk size.
+    :return: An iterator over the chunks, in order.
+    :raises: ValueError if the sizes are not increasing.
+    """
+
+    if not 0 < min_size < avg_size < max_size:
+        raise ValueError("Chunk sizes must satisfy 0 < min_size < avg_size < max_size.")
+
+    bits = avg_size.bit_length() - 1
+    mask_s = _mask(bits + _NORMALIZATION)
+    mask_l = _mask(bits - _NORMALIZATION)
+
+    start = 0
+    end = len(data)
+    while start < end:
+        cut = _cut_point(data, start, end, min_size, avg_size, max_size, mask_s, mask_l)
+        yield data[start:cut]
+        start = cut
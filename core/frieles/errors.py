@@ -8,3 +8,74 @@ class InvalidStoreError(Exception):
         if msg is None:
             msg = "Invalid provider name informed."
         super().__init__(msg)
+
+
+class PresignNotSupportedError(Exception):
+    """
+    Raised when pre-signed URLs are requested for a provider
+    that cannot issue them.
+    """
+
+    def __init__(self, msg: str | None = None) -> None:
+        if msg is None:
+            msg = "Provider does not support pre-signed URLs."
+        super().__init__(msg)
+
+
+class InvalidSettingsError(Exception):
+    """
+    Raised when the settings are missing from the environment
+    or the `.env` file is invalid.
+    """
+
+    def __init__(self, msg: str | None = None) -> None:
+        if msg is None:
+            msg = "Invalid or missing settings."
+        super().__init__(msg)
+
+
+class InvalidUpdateDict(Exception):
+    """
+    Raised when an update is requested without any field to update.
+    """
+
+    def __init__(self, msg: str | None = None) -> None:
+        if msg is None:
+            msg = "No field to update informed."
+        super().__init__(msg)
+
+
+class BlobExistsError(Exception):
+    """
+    Raised when an upload is requested for a blob reference
+    the location already has.
+    """
+
+    def __init__(self, msg: str | None = None) -> None:
+        if msg is None:
+            msg = "Blob already exists in store."
+        super().__init__(msg)
+
+
+class BlobMismatchError(Exception):
+    """
+    Raised when uploaded content does not hash to the blob reference
+    it was uploaded under.
+    """
+
+    def __init__(self, msg: str | None = None) -> None:
+        if msg is None:
+            msg = "Uploaded content does not match its blob reference."
+        super().__init__(msg)
+
+
+class AmbiguousFileError(Exception):
+    """
+    Raised when a blob reference matches files in several locations
+    and no location was given to pick one.
+    """
+
+    def __init__(self, msg: str | None = None) -> None:
+        if msg is None:
+            msg = "Blob reference matches files in several locations."
+        super().__init__(msg)
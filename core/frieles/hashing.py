@@ -0,0 +1,53 @@
+"""
+Incremental blob references, for content too large to hold in memory.
+
+A blob reference is `redbaby.hashing.get_hash(str(content))`: the sha3-224
+multihash, base58btc-encoded, of the repr of the content bytes. That repr
+quotes with single quotes unless the content has a single quote and no
+double quote, which is only known once the whole content has been seen,
+so both renderings are hashed side by side until then.
+"""
+
+import hashlib
+
+from multiformats import multibase, multihash
+
+
+class BlobHasher:
+    """
+    Compute the blob reference of content fed in pieces.
+
+    >>> hasher = BlobHasher()
+    >>> for piece in pieces:
+    ...     hasher.update(piece)
+    >>> hasher.blob_ref() == get_hash(str(b"".join(pieces)))
+    True
+    """
+
+    def __init__(self) -> None:
+        self._single = hashlib.sha3_224(b"b'")
+        self._double = hashlib.sha3_224(b'b"')
+        self._has_single = False
+        self._has_double = False
+
+    def update(self, data: bytes) -> None:
+        # a trailing double quote forces single-quoted repr, escaping
+        # every single quote in `data` the same way whatever it contains
+        body = repr(data + b'"')[2:-2]
+        self._single.update(body.encode())
+        if not self._has_double:
+            # double-quoted repr leaves single quotes unescaped
+            self._double.update(body.replace("\\'", "'").encode())
+
+        self._has_single = self._has_single or b"'" in data
+        self._has_double = self._has_double or b'"' in data
+
+    def blob_ref(self) -> str:
+        if self._has_single and not self._has_double:
+            digest, quote = self._double.copy(), b'"'
+        else:
+            digest, quote = self._single.copy(), b"'"
+        digest.update(quote)
+        return multibase.encode(
+            multihash.wrap(digest.digest(), "sha3-224"), "base58btc"
+        )
@@ -0,0 +1,387 @@
+"""
+Per-operation instrumentation for the store and its drivers.
+
+Operations are wrapped with `observe` (or the `instrumented` decorator) and
+reported to the registered hooks. Lazy results are observed with `observe_iter`
+(or `instrumented_iter`) until they are exhausted, counting only the time spent
+producing items. Without hooks, `observe` hands back a shared no-op, so an
+uninstrumented process only pays for a tuple truthiness check.
+"""
+
+import functools
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator
+
+ANY_PROVIDER = "any"
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Hook:
+    """Receives the start and end of every observed operation."""
+
+    def on_start(self, observation: "Observation") -> Any:
+        return None
+
+    def on_end(self, observation: "Observation", state: Any, duration: float) -> None:
+        pass
+
+
+_hooks: tuple[Hook, ...] = ()
+
+
+def add_hook(hook: Hook) -> None:
+    global _hooks
+    if hook not in _hooks:
+        _hooks = (*_hooks, hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    global _hooks
+    _hooks = tuple(h for h in _hooks if h is not hook)
+
+
+class Observation:
+    __slots__ = (
+        "operation",
+        "provider",
+        "nbytes",
+        "error",
+        "lazy",
+        "_hooks",
+        "_states",
+        "_start",
+    )
+
+    def __init__(
+        self,
+        operation: str,
+        provider: str,
+        hooks: tuple[Hook, ...],
+        lazy: bool = False,
+    ) -> None:
+        self.operation = operation
+        self.provider = provider
+        self.nbytes = 0
+        self.error: type[BaseException] | None = None
+        # lazy observations end wherever their result is exhausted, possibly
+        # in another thread or context than the one they started in
+        self.lazy = lazy
+        self._hooks = hooks
+
+    def record_bytes(self, nbytes: int) -> None:
+        self.nbytes += nbytes
+
+    def _begin(self) -> None:
+        self._states = [hook.on_start(self) for hook in self._hooks]
+
+    def _end(self, duration: float) -> None:
+        for hook, state in zip(self._hooks, self._states):
+            hook.on_end(self, state, duration)
+
+    def __enter__(self) -> "Observation":
+        self._begin()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = time.perf_counter() - self._start
+        self.error = exc_type
+        self._end(duration)
+        return False
+
+
+class _NoopObservation:
+    __slots__ = ()
+
+    def record_bytes(self, nbytes: int) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopObservation":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP = _NoopObservation()
+
+
+def observe(
+    operation: str, provider: str = ANY_PROVIDER
+) -> Observation | _NoopObservation:
+    """
+    Observe an operation as a context manager.
+
+    >>> with observe("driver.find", "s3") as obs:
+    ...     obs.record_bytes(1024)
+    """
+
+    hooks = _hooks
+    if not hooks:
+        return _NOOP
+    return Observation(operation, provider, hooks)
+
+
+def _observed(
+    iterator: Iterator,
+    observation: Observation,
+    elapsed: float,
+    nbytes: Callable[[Any], int] | None,
+) -> Iterator:
+    # the observation ends once the iterator is exhausted, fails or is closed
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                elapsed += time.perf_counter() - start
+                return
+            except BaseException as e:
+                elapsed += time.perf_counter() - start
+                observation.error = type(e)
+                raise
+            elapsed += time.perf_counter() - start
+            if nbytes is not None:
+                observation.record_bytes(nbytes(item))
+            yield item
+    finally:
+        observation._end(elapsed)
+
+
+def observe_iter(
+    iterable: Iterable,
+    operation: str,
+    provider: str = ANY_PROVIDER,
+    nbytes: Callable[[Any], int] | None = None,
+) -> Iterator:
+    """
+    Observe the iteration of a lazy result, such as a cursor.
+
+    Only the time spent producing items is counted, not the time the
+    consumer spends between them.
+
+    >>> rows = observe_iter(collection.find(), "metadata.find")
+    """
+
+    hooks = _hooks
+    if not hooks:
+        return iter(iterable)
+
+    observation = Observation(operation, provider, hooks, lazy=True)
+    observation._begin()
+    return _observed(iter(iterable), observation, 0.0, nbytes)
+
+
+def instrumented(operation: str, provider: str = ANY_PROVIDER) -> Callable:
+    """Observe every call of the decorated function."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            hooks = _hooks
+            if not hooks:
+                return func(*args, **kwargs)
+            with Observation(operation, provider, hooks):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def instrumented_iter(
+    operation: str,
+    provider: str = ANY_PROVIDER,
+    nbytes: Callable[[Any], int] | None = None,
+) -> Callable:
+    """
+    Observe every call of the decorated function, which returns a lazy
+    result, from the call until the result is exhausted.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            hooks = _hooks
+            if not hooks:
+                return func(*args, **kwargs)
+
+            observation = Observation(operation, provider, hooks, lazy=True)
+            observation._begin()
+            start = time.perf_counter()
+            try:
+                iterator = iter(func(*args, **kwargs))
+            except BaseException as e:
+                observation.error = type(e)
+                observation._end(time.perf_counter() - start)
+                raise
+            return _observed(iterator, observation, time.perf_counter() - start, nbytes)
+
+        return wrapper
+
+    return decorator
+
+
+class _Series:
+    __slots__ = ("buckets", "count", "sum", "bytes", "errors")
+
+    def __init__(self, nbuckets: int) -> None:
+        self.buckets = [0] * nbuckets
+        self.count = 0
+        self.sum = 0.0
+        self.bytes = 0
+        self.errors = 0
+
+
+class MetricsRegistry(Hook):
+    """
+    In-process latency histograms, byte and error counters labeled by
+    operation and provider, rendered in the Prometheus text format.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._series: dict[tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+
+    def on_end(self, observation: Observation, state: Any, duration: float) -> None:
+        key = (observation.operation, observation.provider)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.buckets))
+
+            for i, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    series.buckets[i] += 1
+                    break
+            series.count += 1
+            series.sum += duration
+            series.bytes += observation.nbytes
+            if observation.error is not None:
+                series.errors += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self) -> dict[tuple[str, str], dict[str, Any]]:
+        with self._lock:
+            return {
+                key: dict(
+                    buckets=list(series.buckets),
+                    count=series.count,
+                    sum=series.sum,
+                    bytes=series.bytes,
+                    errors=series.errors,
+                )
+                for key, series in self._series.items()
+            }
+
+    def render(self) -> str:
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP frieles_operation_duration_seconds Latency of store operations.",
+            "# TYPE frieles_operation_duration_seconds histogram",
+        ]
+        for (operation, provider), series in sorted(snapshot.items()):
+            labels = f'operation="{operation}",provider="{provider}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, series["buckets"]):
+                cumulative += count
+                lines.append(
+                    f"frieles_operation_duration_seconds_bucket"
+                    f'{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f"frieles_operation_duration_seconds_bucket"
+                f'{{{labels},le="+Inf"}} {series["count"]}'
+            )
+            lines.append(
+                f"frieles_operation_duration_seconds_sum{{{labels}}} {series['sum']}"
+            )
+            lines.append(
+                f"frieles_operation_duration_seconds_count{{{labels}}} {series['count']}"
+            )
+
+        for name, field, help_text in (
+            (
+                "frieles_operation_bytes_total",
+                "bytes",
+                "Bytes moved by store operations.",
+            ),
+            ("frieles_operation_errors_total", "errors", "Failed store operations."),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (operation, provider), series in sorted(snapshot.items()):
+                labels = f'operation="{operation}",provider="{provider}"'
+                lines.append(f"{name}{{{labels}}} {series[field]}")
+
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryHook(Hook):
+    """
+    Emit an OpenTelemetry span per observed operation.
+
+    Spans of operations run as a block are made current until they end, so
+    the operations they run nest under them. Spans of lazy operations are
+    not: their end may run in another context, where it cannot be detached.
+    """
+
+    def __init__(self, tracer_name: str = "frieles") -> None:
+        try:
+            from opentelemetry import context, trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetry spans require the 'opentelemetry-api' package, "
+                "install frieles with the 'otel' extra."
+            ) from e
+
+        self._context = context
+        self._trace = trace
+        self._tracer = trace.get_tracer(tracer_name)
+
+    def on_start(self, observation: Observation) -> Any:
+        span = self._tracer.start_span(
+            f"frieles.{observation.operation}",
+            attributes={"frieles.provider": observation.provider},
+        )
+        if observation.lazy:
+            return span, None
+        return span, self._context.attach(self._trace.set_span_in_context(span))
+
+    def on_end(self, observation: Observation, state: Any, duration: float) -> None:
+        span, token = state
+        if token is not None:
+            self._context.detach(token)
+        span.set_attribute("frieles.bytes", observation.nbytes)
+        if observation.error is not None:
+            span.set_status(
+                self._trace.Status(
+                    self._trace.StatusCode.ERROR, observation.error.__name__
+                )
+            )
+        span.end()
+
+
+metrics = MetricsRegistry()
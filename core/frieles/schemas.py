@@ -1,9 +1,9 @@
 from datetime import datetime
 from typing import Any, Literal
 
-from pydantic import BaseModel, Field
-from pymongo import IndexModel
-from redbaby.behaviors import ReadingMixin, Timestamping
+from pydantic import BaseModel, ConfigDict, Field
+from pymongo import ASCENDING, IndexModel
+from redbaby.behaviors import ReadingMixin
 from redbaby.document import Document
 from redbaby.hashing import HashDigest
 from redbaby.pyobjectid import PyObjectId
@@ -14,8 +14,10 @@ from .stores import (
     LocalStoreConfig,
     MongoBlob,
     MongoStoreConfig,
+    PresignedUpload,
     S3Blob,
     S3StoreConfig,
+    UploadedPart,
 )
 
 ConfigType = S3StoreConfig | MongoStoreConfig | LocalStoreConfig
@@ -38,7 +40,16 @@ class Metadata(BaseModel):
     extras: dict[str, Any] | None = None
 
 
-class File[T: BaseModel](ReadingMixin, Timestamping, Document):
+class Creator(BaseModel):
+    """
+    Creator of a file as read back from the store, keeping whatever
+    fields it was stored with.
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+
+class File[T: BaseModel](ReadingMixin, Document):
     id: PyObjectId = Field(alias="_id", default_factory=PyObjectId)
 
     metadata: Metadata
@@ -49,6 +60,9 @@ class File[T: BaseModel](ReadingMixin, Timestamping, Document):
 
     search_tags: dict[str, Any] = Field(default_factory=dict)
 
+    # blob stored as content-defined chunks, see `ChunkManifest`
+    chunked: bool = False
+
     @classmethod
     def collection_name(cls) -> str:
         return "files"
@@ -62,6 +76,142 @@ class File[T: BaseModel](ReadingMixin, Timestamping, Document):
         ]
 
 
+class Chunk(ReadingMixin, Document):
+    """
+    A unique chunk stored in a location, shared by every chunked blob
+    that contains it and deleted once no manifest references it.
+    """
+
+    id: PyObjectId = Field(alias="_id", default_factory=PyObjectId)
+
+    chunk_ref: HashDigest
+    location: Location
+    size_bytes: int
+    refs: int = 0
+
+    @classmethod
+    def collection_name(cls) -> str:
+        return "chunks"
+
+    @classmethod
+    def indexes(cls) -> list[IndexModel]:
+        return [
+            IndexModel(
+                [("chunk_ref", ASCENDING), ("location", ASCENDING)], unique=True
+            ),
+        ]
+
+
+class ChunkManifest(ReadingMixin, Document):
+    """
+    The ordered chunks a chunked blob is reassembled from in a location,
+    shared by every file with that content and deleted once none is left.
+    """
+
+    id: PyObjectId = Field(alias="_id", default_factory=PyObjectId)
+
+    blob_ref: HashDigest
+    location: Location
+    chunks: list[HashDigest]
+    size_bytes: int
+    refs: int = 0
+
+    @classmethod
+    def collection_name(cls) -> str:
+        return "manifests"
+
+    @classmethod
+    def indexes(cls) -> list[IndexModel]:
+        return [
+            IndexModel([("blob_ref", ASCENDING), ("location", ASCENDING)], unique=True),
+        ]
+
+
+class Usage(ReadingMixin, Document):
+    """
+    Running count and `Metadata.size_bytes` sum of the files sharing a
+    provider, creator and mimetype.
+    """
+
+    id: PyObjectId = Field(alias="_id", default_factory=PyObjectId)
+
+    provider: Provider
+    created_by: dict[str, Any]
+    mimetype: str
+
+    count: int = 0
+    size_bytes: int = 0
+
+    @classmethod
+    def collection_name(cls) -> str:
+        return "usage"
+
+    @classmethod
+    def indexes(cls) -> list[IndexModel]:
+        return [
+            IndexModel(
+                [
+                    ("provider", ASCENDING),
+                    ("created_by", ASCENDING),
+                    ("mimetype", ASCENDING),
+                ],
+                unique=True,
+            ),
+        ]
+
+
+class FileRecord:
+    """
+    Lightweight, unvalidated view of a `File` document.
+
+    Built straight from the raw MongoDB document, so fields that were not
+    projected are `None` and nested values are kept as plain dicts.
+    """
+
+    __slots__ = (
+        "id",
+        "metadata",
+        "location",
+        "blob_ref",
+        "created_by",
+        "search_tags",
+        "created_at",
+        "updated_at",
+        "chunked",
+        "blob",
+    )
+
+    def __init__(self, doc: dict[str, Any], blob: Blob | None = None) -> None:
+        self.id = doc.get("_id")
+        self.metadata = doc.get("metadata")
+        self.location = doc.get("location")
+        self.blob_ref = doc.get("blob_ref")
+        self.created_by = doc.get("created_by")
+        self.search_tags = doc.get("search_tags")
+        self.created_at = doc.get("created_at")
+        self.updated_at = doc.get("updated_at")
+        self.chunked = doc.get("chunked")
+        self.blob = blob
+
+    def __repr__(self) -> str:
+        return f"FileRecord(id={self.id!r}, blob_ref={self.blob_ref!r})"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the loaded fields as a dict, using the document's `_id` alias."""
+
+        data = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            if name == "id":
+                name = "_id"
+            elif name == "blob":
+                value = value.model_dump()
+            data[name] = value
+        return data
+
+
 class BlobbedFile[T: BaseModel](BaseModel):
     blob: Blob
     metadata: Metadata
@@ -70,3 +220,23 @@ class BlobbedFile[T: BaseModel](BaseModel):
     created_by: T
 
     search_tags: dict[str, Any] = Field(default_factory=dict)
+
+
+class ArchiveImport(BaseModel):
+    imported: int = 0
+    skipped: int = 0
+
+
+class UploadedFile[T: BaseModel](BaseModel):
+    """
+    A file whose blob was uploaded straight to the provider through a
+    pre-signed URL, keyed by the `blob_ref` the client computed.
+    """
+
+    blob_ref: HashDigest
+    metadata: Metadata
+    location: Location
+
+    created_by: T
+
+    search_tags: dict[str, Any] = Field(default_factory=dict)
@@ -1,9 +1,11 @@
+import functools
 import pathlib
-import sys
 
 from pydantic import ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .errors import InvalidSettingsError
+
 
 class Settings(BaseSettings):
     DB_URI: str
@@ -16,13 +18,27 @@ class Settings(BaseSettings):
     )
 
 
-try:
-    settings = Settings()
-except ValidationError as e:
-    directory = pathlib.Path(".").absolute()
-    print(
-        f"The .env file is invalid or could not be "
-        f"found on the current directory={directory}.\nValidation: {e}",
-        file=sys.stderr,
-    )
-    exit(-1)
+@functools.cache
+def get_settings() -> Settings:
+    """
+    Resolve the settings on first use, from the environment and
+    the `.env` file on the current directory.
+
+    :return: The settings.
+    :raises InvalidSettingsError if the settings are missing or invalid.
+    """
+
+    try:
+        return Settings()
+    except ValidationError as e:
+        directory = pathlib.Path(".").absolute()
+        raise InvalidSettingsError(
+            f"The .env file is invalid or could not be "
+            f"found on the current directory={directory}.\nValidation: {e}"
+        ) from e
+
+
+def __getattr__(name: str):
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,45 @@
-from typing import Any, Iterable, Literal, overload
-
-from pymongo.results import DeleteResult, InsertOneResult, UpdateResult
-from redbaby.errors import DocumentNotFound, InvalidUpdateDict
-
-from .errors import InvalidStoreError
-from .schemas import Blob, BlobbedFile, File, Literal, Location, Metadata, Provider
-from .stores import LocalDriver, MongoDriver, S3Driver
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, Literal, overload
+
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+from pymongo.results import (
+    DeleteResult,
+    InsertManyResult,
+    InsertOneResult,
+    UpdateResult,
+)
+from redbaby.errors import DocumentNotFound
+from redbaby.hashing import get_hash
+
+from .chunking import chunk
+from .errors import (
+    AmbiguousFileError,
+    BlobExistsError,
+    InvalidStoreError,
+    InvalidUpdateDict,
+    PresignNotSupportedError,
+)
+from .instrumentation import instrumented, instrumented_iter, observe, observe_iter
+from .schemas import (
+    Blob,
+    BlobbedFile,
+    Chunk,
+    ChunkManifest,
+    Creator,
+    File,
+    FileRecord,
+    Literal,
+    Location,
+    Metadata,
+    PresignedUpload,
+    Provider,
+    UploadedFile,
+    UploadedPart,
+)
+from .stores import CHUNK_PREFIX, LocalDriver, MongoDriver, S3Driver
+from .usage import USAGE_FIELDS, UsageKey, record_usage, usage_stats
 from .utils import flatten_collections
 
 Driver = LocalDriver | MongoDriver | S3Driver
@@ -17,12 +51,13 @@ BLOB_DRIVER_MAP: dict[Provider, Driver] = {
 }
 
 
-def find_blob(blob_ref: str, location: Location) -> Blob:
+def find_blob(blob_ref: str, location: Location, prefix: str = "") -> Blob:
     """
     Find a blob in store.
 
     :param blob_ref: The blob reference of the file to find.
     :param location: The location of the store.
+    :param prefix: The key prefix the blob is stored under.
     :return: The blob content.
     :raises: DocumentNotFound if the file does not exist.
     :raises InvalidStoreError if the provider is not one of ["local", "mongodb", "s3"].
@@ -32,15 +67,19 @@ def find_blob(blob_ref: str, location: Location) -> Blob:
     if driver is None:
         raise InvalidStoreError
 
-    return driver.find(blob_ref, location.config)
+    with observe("blob.find", location.provider) as obs:
+        blob = driver.find(blob_ref, location.config, prefix)
+        obs.record_bytes(len(blob.content))
+    return blob
 
 
-def insert_blob(blob: Blob, location: Location) -> str:
+def insert_blob(blob: Blob, location: Location, prefix: str = "") -> str:
     """
     Insert a blob in store.
 
     :param blob: The blob to insert.
     :param location: The location of the store.
+    :param prefix: The key prefix to store the blob under.
     :return: The blob reference.
     :raises InvalidStoreError if the provider is not one of ["local", "mongodb", "s3"].
     """
@@ -49,15 +88,18 @@ def insert_blob(blob: Blob, location: Location) -> str:
     if driver is None:
         raise InvalidStoreError
 
-    return driver.insert(blob, location.config)
+    with observe("blob.insert", location.provider) as obs:
+        obs.record_bytes(len(blob.content))
+        return driver.insert(blob, location.config, prefix)
 
 
-def delete_blob(blob_ref: str, location: Location) -> str:
+def delete_blob(blob_ref: str, location: Location, prefix: str = "") -> str:
     """
     Delete a blob from store.
 
     :param blob_ref: The blob reference of the file to delete.
     :param location: The location of the store.
+    :param prefix: The key prefix the blob is stored under.
     :return: The blob reference.
     :raises InvalidStoreError if the provider is not one of ["local", "mongodb", "s3"].
     """
@@ -66,27 +108,385 @@ def delete_blob(blob_ref: str, location: Location) -> str:
     if driver is None:
         raise InvalidStoreError
 
-    return driver.delete(blob_ref, location.config)
+    with observe("blob.delete", location.provider):
+        return driver.delete(blob_ref, location.config, prefix)
+
+
+def _release_chunks(chunk_refs: list[str], location: Location) -> None:
+    """Drop a reference to each chunk, deleting the chunks no longer referenced."""
+
+    location_doc = location.model_dump()
+    col = Chunk.collection()
+    counts = Counter(chunk_refs)
+    col.bulk_write(
+        [
+            UpdateOne(
+                {"chunk_ref": chunk_ref, "location": location_doc},
+                {"$inc": {"refs": -count}},
+            )
+            for chunk_ref, count in counts.items()
+        ],
+        ordered=False,
+    )
+
+    released = col.find(
+        {
+            "chunk_ref": {"$in": list(counts)},
+            "location": location_doc,
+            "refs": {"$lte": 0},
+        },
+        projection={"chunk_ref": 1},
+    )
+    for doc in released:
+        # a concurrent insert may have referenced the chunk again meanwhile
+        result = col.delete_one({"_id": doc["_id"], "refs": {"$lte": 0}})
+        if result.deleted_count:
+            delete_blob(doc["chunk_ref"], location, CHUNK_PREFIX)
+
+
+def insert_chunked_blob(blob: Blob, location: Location) -> str:
+    """
+    Insert a blob in store as content-defined chunks, storing only the
+    chunks the location does not have yet. Content the location already
+    has only gains a reference.
+
+    :param blob: The blob to insert.
+    :param location: The location of the store.
+    :return: The blob reference of the whole content.
+    :raises InvalidStoreError if the provider is not one of ["local", "mongodb", "s3"].
+    """
+
+    with observe("hashing", location.provider):
+        blob_ref = get_hash(str(blob.content))
+
+    location_doc = location.model_dump()
+    manifest_filter = {"blob_ref": blob_ref, "location": location_doc}
+    manifests = ChunkManifest.collection()
+    hit = manifests.find_one_and_update(
+        manifest_filter, {"$inc": {"refs": 1}}, projection={"_id": 1}
+    )
+    if hit is not None:
+        return blob_ref
+
+    col = Chunk.collection()
+    with observe("blob.insert_chunked", location.provider) as obs:
+        # spans rather than chunk copies, only missing chunks are sliced out
+        chunk_refs = []
+        spans: dict[str, tuple[int, int]] = {}  # chunk_ref -> (start, size)
+        offset = 0
+        for data in chunk(blob.content):
+            chunk_ref = get_hash(str(data))
+            chunk_refs.append(chunk_ref)
+            spans.setdefault(chunk_ref, (offset, len(data)))
+            offset += len(data)
+
+        stored = {
+            doc["chunk_ref"]
+            for doc in col.find(
+                {"chunk_ref": {"$in": list(spans)}, "location": location_doc},
+                projection={"chunk_ref": 1},
+            )
+        }
+        for chunk_ref, (start, size) in spans.items():
+            if chunk_ref in stored:
+                continue
+            try:
+                insert_blob(
+                    Blob(content=blob.content[start : start + size]),
+                    location,
+                    CHUNK_PREFIX,
+                )
+            except DuplicateKeyError:
+                pass  # stored by a concurrent insert
+            obs.record_bytes(size)
+
+        col.bulk_write(
+            [
+                UpdateOne(
+                    {"chunk_ref": chunk_ref, "location": location_doc},
+                    {
+                        "$inc": {"refs": count},
+                        "$setOnInsert": {"size_bytes": spans[chunk_ref][1]},
+                    },
+                    upsert=True,
+                )
+                for chunk_ref, count in Counter(chunk_refs).items()
+            ],
+            ordered=False,
+        )
+
+    manifest = ChunkManifest(
+        blob_ref=blob_ref,
+        location=location,
+        chunks=chunk_refs,
+        size_bytes=len(blob.content),
+        refs=1,
+    )
+    try:
+        manifests.insert_one(manifest.model_dump(by_alias=True))
+    except DuplicateKeyError:
+        # a concurrent insert stored the same content first, reference its
+        # manifest and give back the chunk references taken above
+        manifests.update_one(manifest_filter, {"$inc": {"refs": 1}})
+        _release_chunks(chunk_refs, location)
+    return blob_ref
+
+
+def iter_chunked_blob(blob_ref: str, location: Location) -> Iterator[bytes]:
+    """
+    Stream a chunked blob from store, one chunk at a time.
+
+    :param blob_ref: The blob reference of the file to find.
+    :param location: The location of the store.
+    :return: An iterator over the blob content.
+    :raises: DocumentNotFound if the blob has no chunk manifest.
+    """
+
+    manifest = ChunkManifest.collection().find_one(
+        {"blob_ref": blob_ref, "location": location.model_dump()},
+        projection={"chunks": 1},
+    )
+    if manifest is None:
+        raise DocumentNotFound(f"Chunk manifest for blob {blob_ref} not found")
+
+    return (
+        find_blob(chunk_ref, location, CHUNK_PREFIX).content
+        for chunk_ref in manifest["chunks"]
+    )
+
+
+def delete_chunked_blob(blob_ref: str, location: Location) -> str:
+    """
+    Drop a reference to a chunked blob, deleting its manifest and the
+    chunks no other blob references once no file is left with its content.
+
+    :param blob_ref: The blob reference of the file to delete.
+    :param location: The location of the store.
+    :return: The blob reference.
+    :raises: DocumentNotFound if the blob has no chunk manifest.
+    """
+
+    manifests = ChunkManifest.collection()
+    manifest = manifests.find_one_and_update(
+        {"blob_ref": blob_ref, "location": location.model_dump()},
+        {"$inc": {"refs": -1}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if manifest is None:
+        raise DocumentNotFound(f"Chunk manifest for blob {blob_ref} not found")
+    if manifest["refs"] > 0:
+        return blob_ref
+
+    # a concurrent insert may have referenced the manifest again meanwhile
+    result = manifests.delete_one({"_id": manifest["_id"], "refs": {"$lte": 0}})
+    if result.deleted_count:
+        _release_chunks(manifest["chunks"], location)
+    return blob_ref
+
+
+def insert_blobs(
+    blobs: list[tuple[Blob, Location, bool]],
+    workers: int = 8,
+) -> list[str]:
+    """
+    Insert blobs in store in parallel.
+
+    :param blobs: The blobs to insert, with their location and whether
+        they are stored as chunks.
+    :param workers: The number of blobs written concurrently.
+    :return: The blob references, in order.
+    :raises InvalidStoreError if a provider is not one of ["local", "mongodb", "s3"].
+    """
+
+    def insert(item: tuple[Blob, Location, bool]) -> str:
+        blob, location, chunked = item
+        if chunked:
+            return insert_chunked_blob(blob, location)
+        return insert_blob(blob, location)
+
+    if len(blobs) <= 1 or workers <= 1:
+        return [insert(item) for item in blobs]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(insert, blobs))
+
+
+def presign_find_blob(blob_ref: str, location: Location, expires_in: int) -> str:
+    """
+    Issue a pre-signed URL to download a blob straight from the store.
+
+    :param blob_ref: The blob reference of the file to download.
+    :param location: The location of the store.
+    :param expires_in: The number of seconds the URL stays valid.
+    :return: The pre-signed URL.
+    :raises InvalidStoreError if the provider is not one of ["local", "mongodb", "s3"].
+    :raises PresignNotSupportedError if the provider cannot issue pre-signed URLs.
+    """
+
+    driver = BLOB_DRIVER_MAP.get(location.provider)
+    if driver is None:
+        raise InvalidStoreError
+
+    return driver.presign_find(blob_ref, location.config, expires_in)
+
+
+def presign_insert_blob(
+    blob_ref: str,
+    location: Location,
+    expires_in: int,
+    parts: int = 1,
+) -> PresignedUpload:
+    """
+    Issue pre-signed URLs to upload a blob straight to the store.
+
+    :param blob_ref: The blob reference the blob will be stored under.
+    :param location: The location of the store.
+    :param expires_in: The number of seconds the URLs stay valid.
+    :param parts: The number of parts of a multipart upload.
+    :return: The upload URLs, one per part, and the staging key they upload to.
+    :raises BlobExistsError if the location already has the blob.
+    :raises InvalidStoreError if the provider is not one of ["local", "mongodb", "s3"].
+    :raises PresignNotSupportedError if the provider cannot issue pre-signed URLs.
+    """
+
+    driver = BLOB_DRIVER_MAP.get(location.provider)
+    if driver is None:
+        raise InvalidStoreError
+
+    return driver.presign_insert(blob_ref, location.config, expires_in, parts)
+
+
+def complete_insert_blob(
+    blob_ref: str,
+    location: Location,
+    key: str,
+    upload_id: str | None = None,
+    parts: list[UploadedPart] | None = None,
+) -> int:
+    """
+    Finish a pre-signed upload, check that the uploaded content hashes to
+    its blob reference and move it there.
+
+    :param blob_ref: The blob reference the blob will be stored under.
+    :param location: The location of the store.
+    :param key: The staging key the blob was uploaded to.
+    :param upload_id: The multipart upload id, if any.
+    :param parts: The uploaded parts of a multipart upload.
+    :return: The size of the stored blob in bytes.
+    :raises: DocumentNotFound if the blob was not uploaded.
+    :raises BlobMismatchError if the content does not hash to the blob reference.
+    :raises InvalidStoreError if the provider is not one of ["local", "mongodb", "s3"].
+    :raises PresignNotSupportedError if the provider cannot issue pre-signed URLs.
+    :raises: ValueError if the key is not a staging key.
+    """
+
+    driver = BLOB_DRIVER_MAP.get(location.provider)
+    if driver is None:
+        raise InvalidStoreError
+
+    return driver.complete_insert(blob_ref, location.config, key, upload_id, parts)
+
+
+def _find_file_blob(dict_file: dict[str, Any]) -> Blob:
+    blob_ref = dict_file["blob_ref"]
+    location = Location(**dict_file["location"])
+    if dict_file.get("chunked"):
+        return Blob(content=b"".join(iter_chunked_blob(blob_ref, location)))
+    return find_blob(blob_ref, location)
+
+
+def _delete_file_blob(file: FileRecord) -> str:
+    location = Location(**file.location)
+    if file.chunked:
+        return delete_chunked_blob(file.blob_ref, location)
+    return delete_blob(file.blob_ref, location)
 
 
 def _inject_blob(dict_file: dict[str, Any]) -> BlobbedFile:
-    blob_ref = dict_file.pop("blob_ref")
-    dict_file["blob"] = find_blob(blob_ref, Location(**dict_file["location"]))
-    return BlobbedFile(**dict_file)
+    dict_file["blob"] = _find_file_blob(dict_file)
+    dict_file.pop("blob_ref")
+    return BlobbedFile[Creator](**dict_file)
+
+
+def _to_record(dict_file: dict[str, Any], return_blob: bool) -> FileRecord:
+    if not return_blob:
+        return FileRecord(dict_file)
+    return FileRecord(dict_file, blob=_find_file_blob(dict_file))
+
+
+def _projection(
+    fields: list[str] | None,
+    return_blob: bool,
+) -> dict[str, int] | None:
+    """
+    Build a MongoDB projection for the given `File` fields.
+
+    When blobs are requested, `blob_ref`, `location` and `chunked` are always
+    projected since they are needed to reach the driver. Subfields of a
+    projected field are dropped, MongoDB rejects such path collisions.
+    `_id` is always projected, so that no fields means only the id rather
+    than an empty projection, which MongoDB reads as the whole document.
+    """
+
+    if fields is None:
+        return None
+
+    projection = {"_id": 1}
+    projection.update({("_id" if f == "id" else f): 1 for f in fields})
+    if return_blob:
+        for required in ("blob_ref", "location", "chunked"):
+            projection[required] = 1
+    return {
+        k: v
+        for k, v in projection.items()
+        if not any(k.startswith(f"{parent}.") for parent in projection)
+    }
+
+
+def _find_one(
+    blob_ref: str,
+    stored_in: Location | None,
+    projection: dict[str, int] | None,
+) -> dict[str, Any]:
+    """
+    Find the single file with a blob reference, in `stored_in` if given.
+
+    A blob reference is only unique per location, an archive imported to
+    another location copies its files there.
+    """
+
+    filters: dict[str, Any] = {"blob_ref": blob_ref}
+    if stored_in is not None:
+        filters["location"] = stored_in.model_dump()
+
+    with observe("metadata.find"):
+        files = File.find(filter=filters, projection=projection, limit=2)
+    if not files:
+        raise DocumentNotFound
+    if len(files) > 1:
+        raise AmbiguousFileError(
+            f"Blob {blob_ref} is stored in several locations, pick one."
+        )
+    return files[0]
 
 
 class Store:
     @staticmethod
-    def create_one(file: BlobbedFile) -> InsertOneResult:
+    @instrumented("store.create_one")
+    def create_one(file: BlobbedFile, chunked: bool = False) -> InsertOneResult:
         """
         Create a single file in store.
 
         :param file: The file to create.
+        :param chunked: If True, stores the blob as deduplicated content-defined chunks.
         :return: The result of the insert operation.
         :raises: DuplicateKeyError if the file already exists or if the blob reference is not unique.
         """
 
-        blob_ref = insert_blob(file.blob, file.location)
+        if chunked:
+            blob_ref = insert_chunked_blob(file.blob, file.location)
+        else:
+            blob_ref = insert_blob(file.blob, file.location)
 
         db_file = File(
             metadata=file.metadata,
@@ -94,12 +494,71 @@ class Store:
             blob_ref=blob_ref,
             created_by=file.created_by,
             search_tags=file.search_tags,
+            chunked=chunked,
         )
-        dict_file = db_file.model_dump(by_alias=True)
+        with observe("serialization"):
+            dict_file = db_file.model_dump(by_alias=True)
 
         col = File.collection()
-        result = col.insert_one(dict_file)
-        raise result
+        with observe("metadata.insert"):
+            result = col.insert_one(dict_file)
+        record_usage(added=[dict_file])
+        return result
+
+    @staticmethod
+    @instrumented("store.create_many")
+    def create_many(
+        files: Iterable[BlobbedFile],
+        chunked: bool = False,
+        batch_size: int = 100,
+        workers: int = 8,
+    ) -> InsertManyResult:
+        """
+        Create files in store in batches, writing the blobs of each batch
+        in parallel and its metadata in a single round trip.
+
+        :param files: The files to create.
+        :param chunked: If True, stores the blobs as deduplicated content-defined chunks.
+        :param batch_size: The number of files held in memory and inserted at once.
+        :param workers: The number of blobs written concurrently.
+        :return: The result of the insert operations.
+        :raises: BulkWriteError if a file already exists.
+        """
+
+        def flush(batch: list[BlobbedFile]) -> list[Any]:
+            blob_refs = insert_blobs(
+                [(file.blob, file.location, chunked) for file in batch], workers
+            )
+            with observe("serialization"):
+                docs = [
+                    File(
+                        metadata=file.metadata,
+                        location=file.location,
+                        blob_ref=blob_ref,
+                        created_by=file.created_by,
+                        search_tags=file.search_tags,
+                        chunked=chunked,
+                    ).model_dump(by_alias=True)
+                    for file, blob_ref in zip(batch, blob_refs)
+                ]
+
+            col = File.collection()
+            with observe("metadata.insert"):
+                inserted_ids = col.insert_many(docs, ordered=False).inserted_ids
+            record_usage(added=docs)
+            return inserted_ids
+
+        inserted_ids = []
+        batch = []
+        for file in files:
+            batch.append(file)
+            if len(batch) >= batch_size:
+                inserted_ids.extend(flush(batch))
+                batch = []
+        if batch:
+            inserted_ids.extend(flush(batch))
+
+        return InsertManyResult(inserted_ids, acknowledged=True)
 
     @staticmethod
     @overload
@@ -111,23 +570,43 @@ class Store:
     @overload
     def read_one(blob_ref: str, return_blob=...) -> File: ...
     @staticmethod
-    def read_one(blob_ref: str, return_blob: bool = False) -> BlobbedFile | File:
+    @overload
+    def read_one(
+        blob_ref: str,
+        return_blob: bool = False,
+        fields: list[str] | None = None,
+        raw: Literal[True] = ...,
+        stored_in: Location | None = None,
+    ) -> FileRecord: ...
+    @staticmethod
+    @instrumented("store.read_one")
+    def read_one(
+        blob_ref: str,
+        return_blob: bool = False,
+        fields: list[str] | None = None,
+        raw: bool = False,
+        stored_in: Location | None = None,
+    ) -> BlobbedFile | File | FileRecord:
         """
         Read a single file from store.
 
         :param blob_ref: The blob reference of the file to read.
         :param return_blob: If True, returns a BlobbedFile with the Blob content.
-        :return: A BlobbedFile or File object.
+        :param fields: The File fields to load (e.g. "metadata.path").
+            Projected reads always return a FileRecord.
+        :param raw: If True, skips validation and returns a FileRecord.
+        :param stored_in: The location of the file, needed when the blob
+            reference is stored in several locations.
+        :return: A BlobbedFile, File or FileRecord object.
         :raises: DocumentNotFound if the file does not exist.
+        :raises AmbiguousFileError if several locations store the blob reference.
         """
 
-        files = File.find(filter={"blob_ref": blob_ref}, limit=1)
-        if not files:
-            raise DocumentNotFound
-
-        dict_file = files[0]
+        dict_file = _find_one(blob_ref, stored_in, _projection(fields, return_blob))
+        if raw or fields is not None:
+            return _to_record(dict_file, return_blob)
         if not return_blob:
-            return File(**dict_file)
+            return File[Creator](**dict_file)
         return _inject_blob(dict_file)
 
     @staticmethod
@@ -149,12 +628,25 @@ class Store:
         filters: dict[str, Any] | None = None,
     ) -> Iterable[File]: ...
     @staticmethod
+    @overload
     def read(
         return_blob: bool = False,
         filters: dict[str, Any] | None = None,
         skip: int = 0,
         limit: int = 0,
-    ) -> Iterable[BlobbedFile] | Iterable[File]:
+        fields: list[str] | None = None,
+        raw: Literal[True] = ...,
+    ) -> Iterable[FileRecord]: ...
+    @staticmethod
+    @instrumented_iter("store.read")
+    def read(
+        return_blob: bool = False,
+        filters: dict[str, Any] | None = None,
+        skip: int = 0,
+        limit: int = 0,
+        fields: list[str] | None = None,
+        raw: bool = False,
+    ) -> Iterable[BlobbedFile] | Iterable[File] | Iterable[FileRecord]:
         """
         Read multiple files from store.
 
@@ -162,20 +654,36 @@ class Store:
         :param filters: A dictionary of filters to apply to the query.
         :param skip: The number of documents to skip.
         :param limit: The maximum number of documents to return.
-        :return: An iterable of BlobbedFile or File objects.
+        :param fields: The File fields to load (e.g. "metadata.path").
+            Projected reads always return FileRecords.
+        :param raw: If True, skips validation and returns FileRecords.
+        :return: An iterable of BlobbedFile, File or FileRecord objects.
         """
 
-        files = File.find(filter=filters, skip=skip, limit=limit, lazy=True)
+        files = observe_iter(
+            File.find(
+                filter=filters,
+                projection=_projection(fields, return_blob),
+                skip=skip,
+                limit=limit,
+                lazy=True,
+            ),
+            "metadata.find",
+        )
+        if raw or fields is not None:
+            return (_to_record(file, return_blob) for file in files)
         if not return_blob:
-            return (File(**file) for file in files)
+            return (File[Creator](**file) for file in files)
         return (_inject_blob(file) for file in files)
 
     @staticmethod
+    @instrumented("store.update_one")
     def update_one(
         blob_ref: str,
         metadata: Metadata | None = None,
         location: Location | None = None,
         search_tags: dict[str, Any] | None = None,
+        stored_in: Location | None = None,
     ) -> UpdateResult:
         """
         Update a single file in store.
@@ -184,18 +692,22 @@ class Store:
         :param metadata: The metadata to update.
         :param location: The location to update.
         :param search_tags: The search tags to update.
+        :param stored_in: The current location of the file, needed when the
+            blob reference is stored in several locations.
         :return: The result of the update operation.
         :raises: InvalidUpdateDict if no update is provided.
+        :raises: DocumentNotFound if the file does not exist.
+        :raises AmbiguousFileError if several locations store the blob reference.
         """
 
+        # replaced as whole subdocuments, merging field by field would keep
+        # the keys of the old provider config and of `metadata.extras`
         update = {}
         if metadata is not None:
-            for k, v in flatten_collections("metadata", metadata):
-                update[k] = v
+            update["metadata"] = metadata.model_dump()
 
         if location is not None:
-            for k, v in flatten_collections("location", metadata):
-                update[k] = v
+            update["location"] = location.model_dump()
 
         if search_tags is not None:
             update["search_tags"] = search_tags
@@ -203,27 +715,52 @@ class Store:
         if not update:
             raise InvalidUpdateDict
 
+        old = _find_one(blob_ref, stored_in, {field: 1 for field in USAGE_FIELDS})
+
         col = File.collection()
-        return col.update_one(filter={"_id": blob_ref}, update={"$set": update})
+        with observe("metadata.update"):
+            result = col.update_one(filter={"_id": old["_id"]}, update={"$set": update})
+
+        if (metadata is not None or location is not None) and result.modified_count:
+            new = {
+                "location": location.model_dump() if location else old["location"],
+                "created_by": old["created_by"],
+                "metadata": metadata.model_dump() if metadata else old["metadata"],
+            }
+            record_usage(added=[new], removed=[old])
+        return result
 
     @staticmethod
-    def delete_one(blob_ref: str) -> DeleteResult:
+    @instrumented("store.delete_one")
+    def delete_one(blob_ref: str, stored_in: Location | None = None) -> DeleteResult:
         """
         Delete a single file from store.
 
         :param blob_ref: The blob reference of the file to delete.
+        :param stored_in: The location of the file, needed when the blob
+            reference is stored in several locations.
         :return: The result of the delete operation.
         :raises: DocumentNotFound if the file does not exist.
-        :raises InvalidStoreError if the file is not unique.
+        :raises AmbiguousFileError if several locations store the blob reference.
+        :raises InvalidStoreError if the provider is not one of ["local", "mongodb", "s3"].
         """
 
-        file = Store.read_one(blob_ref, return_blob=False)
-        delete_blob(blob_ref, file.location)
+        file = Store.read_one(
+            blob_ref,
+            fields=["blob_ref", "location", "chunked", *USAGE_FIELDS],
+            stored_in=stored_in,
+        )
+        _delete_file_blob(file)
 
         col = File.collection()
-        return col.delete_one(filter={"blob_ref": blob_ref})
+        with observe("metadata.delete"):
+            result = col.delete_one(filter={"_id": file.id})
+        if result.deleted_count:
+            record_usage(removed=[file.to_dict()])
+        return result
 
     @staticmethod
+    @instrumented("store.delete")
     def delete(
         blob_ref: str | None = None,
         metadata: Metadata | None = None,
@@ -244,23 +781,175 @@ class Store:
             filter["blob_ref"] = blob_ref
         else:
             if metadata is not None:
-                for k, v in flatten_collections("metadata", metadata):
+                for k, v in flatten_collections("metadata", metadata.model_dump()):
                     filter[k] = v
 
             if location is not None:
-                for k, v in flatten_collections("location", metadata):
+                for k, v in flatten_collections("location", location.model_dump()):
                     filter[k] = v
 
             if search_tags is not None:
                 for k, v in flatten_collections("search_tags", search_tags):
                     filter[k] = v
 
-        files = Store.read(return_blob=False, filters=filter)
+        files = list(
+            Store.read(
+                filters=filter,
+                fields=["blob_ref", "location", "chunked", *USAGE_FIELDS],
+            )
+        )
         for file in files:
-            delete_blob(file.blob_ref, file.location)
+            _delete_file_blob(file)
 
         col = File.collection()
-        return col.delete_many(filter)
+        with observe("metadata.delete"):
+            result = col.delete_many(filter)
+        record_usage(removed=[file.to_dict() for file in files])
+        return result
+
+    @staticmethod
+    @instrumented("store.presign_read")
+    def presign_read(
+        blob_ref: str,
+        expires_in: int = 3600,
+        stored_in: Location | None = None,
+    ) -> str:
+        """
+        Issue a pre-signed URL to download a file's blob from its provider.
+
+        :param blob_ref: The blob reference of the file to download.
+        :param expires_in: The number of seconds the URL stays valid.
+        :param stored_in: The location of the file, needed when the blob
+            reference is stored in several locations.
+        :return: The pre-signed URL.
+        :raises: DocumentNotFound if the file does not exist.
+        :raises AmbiguousFileError if several locations store the blob reference.
+        :raises PresignNotSupportedError if the provider cannot issue pre-signed URLs
+            or the blob is chunked.
+        """
+
+        file = Store.read_one(
+            blob_ref, fields=["location", "chunked"], stored_in=stored_in
+        )
+        if file.chunked:
+            raise PresignNotSupportedError("Chunked blobs cannot be pre-signed.")
+        return presign_find_blob(blob_ref, Location(**file.location), expires_in)
+
+    @staticmethod
+    @instrumented("store.presign_create")
+    def presign_create(
+        blob_ref: str,
+        location: Location,
+        expires_in: int = 3600,
+        parts: int = 1,
+    ) -> PresignedUpload:
+        """
+        Issue pre-signed URLs to upload a blob straight to its provider.
+
+        The URLs upload to a staging key; the file is only registered, and
+        its blob moved to its blob reference, once `Store.complete_create`
+        has checked the uploaded content.
+
+        :param blob_ref: The blob reference the blob will be stored under.
+        :param location: The location of the store.
+        :param expires_in: The number of seconds the URLs stay valid.
+        :param parts: The number of parts of a multipart upload.
+        :return: The upload URLs, one per part, and their staging key.
+        :raises BlobExistsError if the location already has the blob.
+        :raises PresignNotSupportedError if the provider cannot issue pre-signed URLs.
+        """
+
+        col = File.collection()
+        with observe("metadata.find"):
+            existing = col.find_one(
+                {"blob_ref": blob_ref, "location": location.model_dump()},
+                projection={"_id": 1},
+            )
+        if existing is not None:
+            raise BlobExistsError(f"File with blob {blob_ref} already exists.")
+
+        return presign_insert_blob(blob_ref, location, expires_in, parts)
+
+    @staticmethod
+    @instrumented("store.complete_create")
+    def complete_create(
+        file: UploadedFile,
+        key: str,
+        upload_id: str | None = None,
+        parts: list[UploadedPart] | None = None,
+    ) -> InsertOneResult:
+        """
+        Register a file whose blob was uploaded through pre-signed URLs,
+        once its content is checked against its blob reference.
+
+        :param file: The uploaded file.
+        :param key: The staging key returned by `Store.presign_create`.
+        :param upload_id: The multipart upload id, if any.
+        :param parts: The uploaded parts of a multipart upload.
+        :return: The result of the insert operation.
+        :raises: DocumentNotFound if the blob was not uploaded.
+        :raises BlobMismatchError if the content does not hash to the blob reference.
+        :raises: DuplicateKeyError if the file already exists.
+        :raises: ValueError if the key is not a staging key.
+        """
+
+        size_bytes = complete_insert_blob(
+            file.blob_ref, file.location, key, upload_id, parts
+        )
+
+        db_file = File(
+            metadata=file.metadata.model_copy(update={"size_bytes": size_bytes}),
+            location=file.location,
+            blob_ref=file.blob_ref,
+            created_by=file.created_by,
+            search_tags=file.search_tags,
+        )
+        with observe("serialization"):
+            dict_file = db_file.model_dump(by_alias=True)
+
+        col = File.collection()
+        with observe("metadata.insert"):
+            result = col.insert_one(dict_file)
+        record_usage(added=[dict_file])
+        return result
+
+    @staticmethod
+    @instrumented_iter("store.stream", nbytes=len)
+    def stream(blob_ref: str, stored_in: Location | None = None) -> Iterator[bytes]:
+        """
+        Stream the blob content of a single file, reassembling chunked blobs
+        one chunk at a time.
+
+        :param blob_ref: The blob reference of the file to read.
+        :param stored_in: The location of the file, needed when the blob
+            reference is stored in several locations.
+        :return: An iterator over the blob content.
+        :raises: DocumentNotFound if the file does not exist.
+        :raises AmbiguousFileError if several locations store the blob reference.
+        """
+
+        file = Store.read_one(
+            blob_ref, fields=["location", "chunked"], stored_in=stored_in
+        )
+        location = Location(**file.location)
+        if file.chunked:
+            return iter_chunked_blob(blob_ref, location)
+        return iter([find_blob(blob_ref, location).content])
+
+    @staticmethod
+    @instrumented("store.usage")
+    def usage(group_by: list[UsageKey] | None = None) -> list[dict[str, Any]]:
+        """
+        Read storage usage from the precomputed counters.
+
+        :param group_by: The keys to group usage by, among "provider",
+            "created_by" and "mimetype". Defaults to every key, an empty
+            list sums up the whole store.
+        :return: The file count and `Metadata.size_bytes` sum of each group,
+            largest first.
+        """
+
+        return usage_stats(group_by)
 
     @staticmethod
     def cleanup():
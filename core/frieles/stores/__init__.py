@@ -1,4 +1,4 @@
-from .base import Blob
+from .base import CHUNK_PREFIX, Blob, PresignedUpload, UploadedPart
 from .local_store import LocalBlob, LocalDriver, LocalStoreConfig
 from .mongo_store import MongoBlob, MongoDriver, MongoStoreConfig
 from .s3_store import S3Blob, S3Driver, S3StoreConfig
@@ -3,17 +3,63 @@ from typing import Any
 
 from pydantic import BaseModel
 
+from ..errors import PresignNotSupportedError
+
+# key prefix of the chunks of chunked blobs, kept apart from whole blobs
+# with the same content; blob references are base58 and never contain a "/"
+CHUNK_PREFIX = "chunks/"
+
 
 class Blob(BaseModel):
     content: bytes
 
 
+class UploadedPart(BaseModel):
+    part_number: int
+    etag: str
+
+
+class PresignedUpload(BaseModel):
+    blob_ref: str
+    # staging key the URLs upload to, moved to `blob_ref` once verified
+    key: str
+    urls: list[str]
+    expires_in: int
+    upload_id: str | None = None
+
+
 class BlobDriver(ABC):
+    # `prefix` namespaces the key a blob is stored under, so blobs stored
+    # for different purposes never share a key, see `CHUNK_PREFIX`
+
+    @staticmethod
+    def find(blob_ref: str, config: Any, prefix: str = "") -> Blob: ...
+
+    @staticmethod
+    def insert(blob: Blob, config: Any, prefix: str = "") -> str: ...
+
+    @staticmethod
+    def delete(blob_ref: str, config: Any, prefix: str = ""): ...
+
     @staticmethod
-    def find(blob_ref: str, config: Any) -> Blob: ...
+    def presign_find(blob_ref: str, config: Any, expires_in: int) -> str:
+        raise PresignNotSupportedError
 
     @staticmethod
-    def insert(blob: Blob, config: Any) -> str: ...
+    def presign_insert(
+        blob_ref: str,
+        config: Any,
+        expires_in: int,
+        parts: int = 1,
+    ) -> PresignedUpload:
+        raise PresignNotSupportedError
 
     @staticmethod
-    def delete(blob_ref: str, config: Any): ...
+    def complete_insert(
+        blob_ref: str,
+        config: Any,
+        key: str,
+        upload_id: str | None = None,
+        parts: list[UploadedPart] | None = None,
+    ) -> int:
+        raise PresignNotSupportedError
@@ -1,9 +1,10 @@
 from pathlib import Path
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_serializer
 from redbaby.errors import DocumentNotFound
 from redbaby.hashing import get_hash
 
+from ..instrumentation import observe
 from .base import Blob, BlobDriver
 
 
@@ -14,30 +15,42 @@ class LocalBlob(Blob):
 class LocalStoreConfig(BaseModel):
     directory: Path
 
+    @field_serializer("directory")
+    def serialize_directory(self, directory: Path) -> str:
+        return str(directory)
+
 
 class LocalDriver(BlobDriver):
     @staticmethod
-    def find(blob_ref: str, config: LocalStoreConfig) -> LocalBlob:
-        for file in config.directory.glob("**/*"):
-            if file.name == blob_ref:
-                with open(file.absolute(), "rb") as f:
+    def find(blob_ref: str, config: LocalStoreConfig, prefix: str = "") -> LocalBlob:
+        path = config.directory / f"{prefix}{blob_ref}"
+        with observe("driver.find", "local") as obs:
+            try:
+                with open(path, "rb") as f:
                     content = f.read()
-                return LocalBlob(content=content)
-
-        raise DocumentNotFound
+            except FileNotFoundError as e:
+                raise DocumentNotFound(f"Blob {blob_ref} not found") from e
+            obs.record_bytes(len(content))
+        return LocalBlob(content=content)
 
     @staticmethod
-    def insert(blob: Blob, config: LocalStoreConfig) -> str:
-        blob_hash = get_hash(str(blob.content))
-        with open(config.directory / blob_hash, "wb") as f:
-            f.write(blob.content)
+    def insert(blob: Blob, config: LocalStoreConfig, prefix: str = "") -> str:
+        with observe("hashing", "local"):
+            blob_hash = get_hash(str(blob.content))
+
+        path = config.directory / f"{prefix}{blob_hash}"
+        with observe("driver.insert", "local") as obs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(blob.content)
+            obs.record_bytes(len(blob.content))
 
         return blob_hash
 
     @staticmethod
-    def delete(blob_ref: str, config: LocalStoreConfig):
-        for file in config.directory.glob("**/*"):
-            if file.name == blob_ref:
-                file.unlink()
-                return
-        raise DocumentNotFound
+    def delete(blob_ref: str, config: LocalStoreConfig, prefix: str = ""):
+        with observe("driver.delete", "local"):
+            try:
+                (config.directory / f"{prefix}{blob_ref}").unlink()
+            except FileNotFoundError as e:
+                raise DocumentNotFound(f"Blob {blob_ref} not found") from e
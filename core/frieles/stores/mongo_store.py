@@ -4,7 +4,8 @@ from redbaby.database import DB
 from redbaby.document import Document
 from redbaby.errors import DocumentNotFound
 
-from ..settings import settings
+from ..instrumentation import observe
+from ..settings import get_settings
 from .base import Blob, BlobDriver
 
 
@@ -28,37 +29,47 @@ class MongoStoreConfig(BaseModel):
 
 class MongoDriver(BlobDriver):
     @staticmethod
-    def find(blob_ref: str, config: MongoStoreConfig) -> MongoBlob:
+    def find(blob_ref: str, config: MongoStoreConfig, prefix: str = "") -> MongoBlob:
         setup_connection(config)
 
         col = MongoBlob.collection(alias=config.database_uri)
-        blobs = col.find(filter={"_id": blob_ref}, limit=1)
-        if not blobs:
-            raise DocumentNotFound(f"Blob with id {blob_ref} not found")
-        return blobs[0]
+        with observe("driver.find", "mongodb") as obs:
+            blobs = list(col.find(filter={"_id": f"{prefix}{blob_ref}"}, limit=1))
+            if not blobs:
+                raise DocumentNotFound(f"Blob with id {blob_ref} not found")
+            blob = MongoBlob(content=blobs[0]["content"])
+            obs.record_bytes(len(blob.content))
+        return blob
 
     @staticmethod
-    def insert(blob: Blob, config: MongoStoreConfig) -> str:
+    def insert(blob: Blob, config: MongoStoreConfig, prefix: str = "") -> str:
         setup_connection(config)
 
         mongo_blob = MongoBlob(content=blob.content)
+        with observe("hashing", "mongodb"):
+            blob_ref = mongo_blob.id
 
+        doc = mongo_blob.model_dump(by_alias=True)
+        doc["_id"] = f"{prefix}{blob_ref}"
         col = MongoBlob.collection(alias=config.database_uri)
-        col.insert_one(mongo_blob.model_dump(by_alias=True))
-        return mongo_blob.id
+        with observe("driver.insert", "mongodb") as obs:
+            col.insert_one(doc)
+            obs.record_bytes(len(blob.content))
+        return blob_ref
 
     @staticmethod
-    def delete(blob_ref: str, config: MongoStoreConfig):
+    def delete(blob_ref: str, config: MongoStoreConfig, prefix: str = ""):
         setup_connection(config)
 
         col = MongoBlob.collection(alias=config.database_uri)
-        col.delete_one(filter={"_id": blob_ref})
+        with observe("driver.delete", "mongodb"):
+            col.delete_one(filter={"_id": f"{prefix}{blob_ref}"})
 
 
 def setup_connection(config: MongoStoreConfig):
     if config.database_uri not in DB.connections:
         DB.add_conn(
-            db_name=settings.DB_NAME,
+            db_name=get_settings().DB_NAME,
             uri=config.database_uri,
             alias=config.database_uri,
             start_client=True,
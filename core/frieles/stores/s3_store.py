@@ -1,11 +1,22 @@
+import uuid
 from typing import Literal
 
-import boto3
 from pydantic import BaseModel
 from redbaby.errors import DocumentNotFound
 from redbaby.hashing import get_hash
 
-from .base import Blob, BlobDriver
+from ..errors import BlobExistsError, BlobMismatchError
+from ..hashing import BlobHasher
+from ..instrumentation import observe
+from .base import Blob, BlobDriver, PresignedUpload, UploadedPart
+
+# presigned uploads land under this prefix and only reach their blob
+# reference once the server has checked their content; blob references are
+# base58 and never contain a "/"
+UPLOAD_PREFIX = "uploads/"
+
+# bytes read at a time when checking an upload
+STREAM_CHUNK_SIZE = 1024 * 1024
 
 
 class S3Blob(Blob):
@@ -35,6 +46,9 @@ class S3Cache:
         if key in cls.sessions:
             return cls.sessions[key]
 
+        # boto3 takes a while to import, only load it once S3 is used
+        import boto3
+
         session = boto3.session.Session(
             aws_access_key_id=config.access_key_id,
             aws_secret_access_key=config.secret_access_key,
@@ -48,6 +62,11 @@ class S3Cache:
         session = cls.get_session(config)
         return session.resource("s3")
 
+    @classmethod
+    def get_client(cls, config: S3StoreConfig):
+        s3 = cls.get_s3(config)
+        return s3.meta.client
+
     @classmethod
     def get_bucket(cls, config: S3StoreConfig):
         s3 = cls.get_s3(config)
@@ -56,33 +75,152 @@ class S3Cache:
 
 class S3Driver(BlobDriver):
     @staticmethod
-    def find(blob_ref: str, config: S3StoreConfig) -> S3Blob:
+    def find(blob_ref: str, config: S3StoreConfig, prefix: str = "") -> S3Blob:
         bucket = S3Cache.get_bucket(config)
+        key = f"{prefix}{blob_ref}"
 
-        objs = list(bucket.objects.filter(Prefix=blob_ref))
-        if not objs:
-            raise DocumentNotFound
+        with observe("driver.find", "s3") as obs:
+            objs = list(bucket.objects.filter(Prefix=key))
 
-        obj = None
-        for returned_obj in objs:
-            if returned_obj.key == blob_ref:
-                obj = returned_obj
-                break
+            obj = None
+            for returned_obj in objs:
+                if returned_obj.key == key:
+                    obj = returned_obj
+                    break
+            if obj is None:
+                raise DocumentNotFound
 
-        response = obj.get()
-        return S3Blob(content=response["Body"].read())
+            response = obj.get()
+            content = response["Body"].read()
+            obs.record_bytes(len(content))
+        return S3Blob(content=content)
 
     @staticmethod
-    def insert(blob: Blob, config: S3StoreConfig) -> str:
-        blob_ref = get_hash(str(blob.content))
+    def insert(blob: Blob, config: S3StoreConfig, prefix: str = "") -> str:
+        with observe("hashing", "s3"):
+            blob_ref = get_hash(str(blob.content))
 
         bucket = S3Cache.get_bucket(config)
 
-        obj = bucket.Object(blob_ref)
-        obj.put(Body=blob.content)
+        with observe("driver.insert", "s3") as obs:
+            obj = bucket.Object(f"{prefix}{blob_ref}")
+            obj.put(Body=blob.content)
+            obs.record_bytes(len(blob.content))
         return blob_ref
 
     @staticmethod
-    def delete(blob_ref: str, config: S3StoreConfig):
-        s3 = S3Cache.get_s3()
-        s3.Object(config.bucket_name, blob_ref).delete()
+    def delete(blob_ref: str, config: S3StoreConfig, prefix: str = ""):
+        s3 = S3Cache.get_s3(config)
+        with observe("driver.delete", "s3"):
+            s3.Object(config.bucket_name, f"{prefix}{blob_ref}").delete()
+
+    @staticmethod
+    def presign_find(blob_ref: str, config: S3StoreConfig, expires_in: int) -> str:
+        client = S3Cache.get_client(config)
+        return client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": config.bucket_name, "Key": blob_ref},
+            ExpiresIn=expires_in,
+        )
+
+    @staticmethod
+    def presign_insert(
+        blob_ref: str,
+        config: S3StoreConfig,
+        expires_in: int,
+        parts: int = 1,
+    ) -> PresignedUpload:
+        client = S3Cache.get_client(config)
+        if _head(client, config.bucket_name, blob_ref) is not None:
+            raise BlobExistsError(f"Blob {blob_ref} already exists in store.")
+
+        key = f"{UPLOAD_PREFIX}{uuid.uuid4().hex}"
+        params = {"Bucket": config.bucket_name, "Key": key}
+
+        if parts == 1:
+            url = client.generate_presigned_url(
+                "put_object", Params=params, ExpiresIn=expires_in
+            )
+            return PresignedUpload(
+                blob_ref=blob_ref, key=key, urls=[url], expires_in=expires_in
+            )
+
+        upload_id = client.create_multipart_upload(**params)["UploadId"]
+        urls = [
+            client.generate_presigned_url(
+                "upload_part",
+                Params={**params, "UploadId": upload_id, "PartNumber": part_number},
+                ExpiresIn=expires_in,
+            )
+            for part_number in range(1, parts + 1)
+        ]
+        return PresignedUpload(
+            blob_ref=blob_ref,
+            key=key,
+            urls=urls,
+            expires_in=expires_in,
+            upload_id=upload_id,
+        )
+
+    @staticmethod
+    def complete_insert(
+        blob_ref: str,
+        config: S3StoreConfig,
+        key: str,
+        upload_id: str | None = None,
+        parts: list[UploadedPart] | None = None,
+    ) -> int:
+        if not key.startswith(UPLOAD_PREFIX):
+            raise ValueError(f"Upload key must start with {UPLOAD_PREFIX!r}.")
+
+        client = S3Cache.get_client(config)
+        params = {"Bucket": config.bucket_name, "Key": key}
+
+        from botocore.exceptions import ClientError
+
+        try:
+            if upload_id is not None:
+                client.complete_multipart_upload(
+                    **params,
+                    UploadId=upload_id,
+                    MultipartUpload={
+                        "Parts": [
+                            {"ETag": part.etag, "PartNumber": part.part_number}
+                            for part in sorted(parts or [], key=lambda p: p.part_number)
+                        ]
+                    },
+                )
+            response = client.get_object(**params)
+        except ClientError as e:
+            raise DocumentNotFound(f"Blob {blob_ref} was not uploaded") from e
+
+        try:
+            # hashed as it streams in, uploads can be far larger than memory
+            hasher = BlobHasher()
+            size = 0
+            with observe("driver.find", "s3") as obs:
+                for piece in response["Body"].iter_chunks(STREAM_CHUNK_SIZE):
+                    hasher.update(piece)
+                    size += len(piece)
+                obs.record_bytes(size)
+
+            if hasher.blob_ref() != blob_ref:
+                raise BlobMismatchError(
+                    f"Uploaded content does not hash to blob {blob_ref}."
+                )
+            with observe("driver.insert", "s3"):
+                client.copy(params, config.bucket_name, blob_ref)
+        finally:
+            client.delete_object(**params)
+        return size
+
+
+def _head(client, bucket_name: str, key: str) -> dict | None:
+    from botocore.exceptions import ClientError
+
+    try:
+        return client.head_object(Bucket=bucket_name, Key=key)
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
@@ -0,0 +1,153 @@
+"""
+Storage usage counters per provider, creator and mimetype.
+
+Every `Store` write adjusts the file count and `Metadata.size_bytes` sum of
+the affected (provider, creator, mimetype) keys, so reading usage costs the
+same however many files are stored. Writes made outside `Store` or
+interrupted halfway make the counters drift; `rebuild_usage` recomputes them
+from the `files` collection.
+"""
+
+from typing import Any, Iterable, Literal
+
+import bson
+from pymongo import UpdateOne
+
+from .instrumentation import observe
+from .schemas import File, Usage
+
+UsageKey = Literal["provider", "created_by", "mimetype"]
+
+USAGE_KEYS: tuple[UsageKey, ...] = ("provider", "created_by", "mimetype")
+
+# `File` fields needed to adjust the counters of a file
+USAGE_FIELDS = [
+    "location.provider",
+    "created_by",
+    "metadata.mimetype",
+    "metadata.size_bytes",
+]
+
+
+def _usage_key(doc: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "provider": doc["location"]["provider"],
+        "created_by": doc["created_by"],
+        "mimetype": doc["metadata"]["mimetype"],
+    }
+
+
+def record_usage(
+    added: Iterable[dict[str, Any]] = (),
+    removed: Iterable[dict[str, Any]] = (),
+) -> None:
+    """
+    Adjust the usage counters for added and removed files, in a single
+    round trip.
+
+    :param added: The `File` documents added to the store.
+    :param removed: The `File` documents removed from the store, with at
+        least the `USAGE_FIELDS` loaded.
+    """
+
+    deltas: dict[tuple, list[Any]] = {}
+    for docs, sign in ((added, 1), (removed, -1)):
+        for doc in docs:
+            key = _usage_key(doc)
+            # creators are unhashable dicts; MongoDB matches embedded
+            # documents field by field in order, and so does their BSON
+            hashable = (
+                key["provider"],
+                bson.encode(key["created_by"]),
+                key["mimetype"],
+            )
+            delta = deltas.setdefault(hashable, [key, 0, 0])
+            delta[1] += sign
+            delta[2] += sign * doc["metadata"]["size_bytes"]
+
+    updates = [
+        UpdateOne(key, {"$inc": {"count": count, "size_bytes": size}}, upsert=True)
+        for key, count, size in deltas.values()
+        if count or size
+    ]
+    if not updates:
+        return
+
+    with observe("usage.update"):
+        Usage.collection().bulk_write(updates, ordered=False)
+
+
+def usage_stats(group_by: Iterable[UsageKey] | None = None) -> list[dict[str, Any]]:
+    """
+    Read storage usage from the counters, never scanning the `files` collection.
+
+    :param group_by: The keys to group usage by. Defaults to every key,
+        an empty list sums up the whole store.
+    :return: The file count and size in bytes of each group, largest first.
+    """
+
+    keys = USAGE_KEYS if group_by is None else tuple(dict.fromkeys(group_by))
+    pipeline = [
+        {"$match": {"count": {"$gt": 0}}},
+        {
+            "$group": {
+                "_id": {key: f"${key}" for key in keys} or None,
+                "count": {"$sum": "$count"},
+                "size_bytes": {"$sum": "$size_bytes"},
+            }
+        },
+        {"$sort": {"size_bytes": -1}},
+    ]
+
+    with observe("usage.find"):
+        groups = Usage.collection().aggregate(pipeline)
+        return [
+            {
+                **(group["_id"] or {}),
+                "count": group["count"],
+                "size_bytes": group["size_bytes"],
+            }
+            for group in groups
+        ]
+
+
+def rebuild_usage() -> int:
+    """
+    Recompute the usage counters from the `files` collection and replace
+    the current ones.
+
+    The counters are swapped in at once, but writes made while the files are
+    being scanned may be missed; run it when the store is quiet.
+
+    :return: The number of counters written.
+    """
+
+    pipeline = [
+        {
+            "$group": {
+                "_id": {
+                    "provider": "$location.provider",
+                    "created_by": "$created_by",
+                    "mimetype": "$metadata.mimetype",
+                },
+                "count": {"$sum": 1},
+                "size_bytes": {"$sum": "$metadata.size_bytes"},
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "provider": "$_id.provider",
+                "created_by": "$_id.created_by",
+                "mimetype": "$_id.mimetype",
+                "count": 1,
+                "size_bytes": 1,
+            }
+        },
+        # replaces the collection atomically and keeps its indexes
+        {"$out": Usage.collection_name()},
+    ]
+
+    with observe("usage.rebuild"):
+        File.collection().aggregate(pipeline, allowDiskUse=True)
+        return Usage.collection().count_documents({})
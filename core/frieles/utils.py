@@ -2,7 +2,7 @@ from typing import Any, Iterable
 
 from redbaby.database import DB
 
-from .settings import settings
+from .settings import get_settings
 
 
 def flatten_collections(acc: str, data: Any) -> Iterable[tuple[str, Any]]:
@@ -19,4 +19,5 @@ def flatten_collections(acc: str, data: Any) -> Iterable[tuple[str, Any]]:
 
 
 def setup_database():
+    settings = get_settings()
     DB.add_conn(db_name=settings.DB_NAME, uri=settings.DB_URI, start_client=True)
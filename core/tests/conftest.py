@@ -0,0 +1,102 @@
+import os
+from datetime import datetime, timezone
+
+os.environ.setdefault("DB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "frieles-test")
+
+import boto3  # noqa: E402
+import mongomock  # noqa: E402
+import pytest  # noqa: E402
+from moto import mock_aws  # noqa: E402
+from redbaby.database import DB  # noqa: E402
+
+from frieles.schemas import (  # noqa: E402
+    Blob,
+    BlobbedFile,
+    Chunk,
+    ChunkManifest,
+    Creator,
+    File,
+    LocalStoreConfig,
+    Location,
+    Metadata,
+    MongoStoreConfig,
+    S3StoreConfig,
+    Usage,
+)
+
+BLOBS_URI = "mongomock://blobs"
+S3_BUCKET = "frieles-test"
+S3_REGION = "us-east-1"
+
+
+@pytest.fixture(autouse=True)
+def database():
+    DB.add_conn(
+        db_name=os.environ["DB_NAME"],
+        uri="mongomock://",
+        start_client=False,
+    )
+    DB.clients["default"] = mongomock.MongoClient()
+    yield
+    for document in (File, Chunk, ChunkManifest, Usage):
+        document.collection().drop()
+
+
+@pytest.fixture
+def location(tmp_path):
+    return Location(provider="local", config=LocalStoreConfig(directory=tmp_path))
+
+
+@pytest.fixture
+def mongo_location():
+    DB.add_conn(
+        db_name=os.environ["DB_NAME"],
+        uri=BLOBS_URI,
+        alias=BLOBS_URI,
+        start_client=False,
+    )
+    DB.clients[BLOBS_URI] = mongomock.MongoClient()
+    return Location(provider="mongodb", config=MongoStoreConfig(database_uri=BLOBS_URI))
+
+
+@pytest.fixture
+def s3_location():
+    with mock_aws():
+        boto3.client("s3", region_name=S3_REGION).create_bucket(Bucket=S3_BUCKET)
+        yield Location(
+            provider="s3",
+            config=S3StoreConfig(
+                access_key_id="testing",
+                secret_access_key="testing",
+                region=S3_REGION,
+                bucket_name=S3_BUCKET,
+                addressing_style="auto",
+            ),
+        )
+
+
+@pytest.fixture(params=["location", "mongo_location", "s3_location"])
+def any_location(request):
+    return request.getfixturevalue(request.param)
+
+
+@pytest.fixture
+def make_file():
+    def make(location: Location, content: bytes, **search_tags) -> BlobbedFile:
+        now = datetime.now(tz=timezone.utc)
+        return BlobbedFile(
+            blob=Blob(content=content),
+            metadata=Metadata(
+                mimetype="text/plain",
+                path="/tests/file.txt",
+                size_bytes=len(content),
+                created_at=now,
+                modified_at=now,
+            ),
+            location=location,
+            created_by=Creator(name="tester"),
+            search_tags=search_tags or {"origin": "test"},
+        )
+
+    return make
@@ -0,0 +1,175 @@
+import io
+import os
+import tarfile
+
+import pytest
+from bson import json_util
+
+from frieles import Store
+from frieles.archive import METADATA_NAME, export_archive, import_archive
+from frieles.schemas import ChunkManifest, File, LocalStoreConfig, Location
+
+
+def exported() -> io.BytesIO:
+    archive = io.BytesIO()
+    export_archive(archive)
+    archive.seek(0)
+    return archive
+
+
+def members(archive: io.BytesIO) -> list[tuple[str, bytes]]:
+    with tarfile.open(fileobj=archive) as tar:
+        return [(m.name, tar.extractfile(m).read()) for m in tar.getmembers()]
+
+
+def packed(entries: list[tuple[str, bytes]]) -> io.BytesIO:
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode="w") as tar:
+        for name, data in entries:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    archive.seek(0)
+    return archive
+
+
+def edited(archive: io.BytesIO, edit) -> io.BytesIO:
+    """Repack `archive` with every metadata line passed through `edit`."""
+
+    entries = members(archive)
+    docs = [json_util.loads(line) for line in entries[0][1].splitlines()]
+    lines = b"".join(json_util.dumps(edit(doc)).encode() + b"\n" for doc in docs)
+    return packed([(METADATA_NAME, lines), *entries[1:]])
+
+
+def clear_metadata() -> None:
+    File.collection().delete_many({})
+
+
+def contents(stored_in: Location | None = None) -> dict[str, bytes]:
+    """The blob content of every file, by its `name` search tag."""
+
+    filters = {} if stored_in is None else {"location": stored_in.model_dump()}
+    files = Store.read(filters=filters, fields=["blob_ref", "location", "search_tags"])
+    return {
+        file.search_tags["name"]: b"".join(
+            Store.stream(file.blob_ref, stored_in=Location(**file.location))
+        )
+        for file in files
+    }
+
+
+@pytest.fixture
+def other(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("other")
+    return Location(provider="local", config=LocalStoreConfig(directory=directory))
+
+
+@pytest.fixture
+def stored(location, make_file):
+    """Two plain files and a chunked one, by name."""
+
+    files = {"a": b"first", "b": b"second", "c": os.urandom(20_000)}
+    for name, content in files.items():
+        Store.create_one(make_file(location, content, name=name), chunked=name == "c")
+    return files
+
+
+def test_round_trip(stored):
+    archive = exported()
+    Store.delete()
+
+    summary = import_archive(archive)
+
+    assert (summary.imported, summary.skipped) == (3, 0)
+    assert contents() == stored
+
+
+@pytest.mark.parametrize("field", ["blob_ref", "location", "metadata"])
+def test_import_rejects_missing_fields(location, make_file, field):
+    Store.create_one(make_file(location, b"content"))
+    archive = edited(
+        exported(), lambda doc: {k: v for k, v in doc.items() if k != field}
+    )
+    clear_metadata()
+
+    with pytest.raises(ValueError, match=f"line 1 of {METADATA_NAME}"):
+        import_archive(archive)
+    assert File.collection().count_documents({}) == 0
+
+
+def test_import_drops_unknown_fields(location, make_file):
+    Store.create_one(make_file(location, b"content"))
+    archive = edited(exported(), lambda doc: {**doc, "injected": {"$gt": ""}})
+    clear_metadata()
+
+    summary = import_archive(archive)
+
+    assert summary.imported == 1
+    assert "injected" not in File.collection().find_one()
+
+
+def test_import_skips_files_in_the_same_location(stored):
+    summary = import_archive(exported())
+
+    assert (summary.imported, summary.skipped) == (0, 3)
+    assert File.collection().count_documents({}) == 3
+
+
+def test_import_to_another_location(stored, location, other):
+    archive = exported()
+
+    summary = import_archive(archive, location=other)
+
+    assert (summary.imported, summary.skipped) == (3, 0)
+    assert contents(location) == stored
+    assert contents(other) == stored
+    assert len(File.collection().distinct("_id")) == 6
+
+    archive.seek(0)
+    summary = import_archive(archive, location=other)
+    assert (summary.imported, summary.skipped) == (0, 3)
+
+
+def test_import_keeps_chunked_files_chunked(stored, location, other):
+    import_archive(exported(), location=other)
+
+    copy = File.collection().find_one(
+        {"search_tags.name": "c", "location": other.model_dump()}
+    )
+    assert copy["chunked"] is True
+    manifests = {
+        m["location"]["config"]["directory"]: m["refs"]
+        for m in ChunkManifest.collection().find()
+    }
+    assert manifests == {
+        str(location.config.directory): 1,
+        str(other.config.directory): 1,
+    }
+
+
+@pytest.mark.parametrize(
+    "repack",
+    [
+        pytest.param(lambda entries: entries[:-1], id="missing-blob"),
+        pytest.param(
+            lambda entries: [entries[0], entries[2], entries[1], *entries[3:]],
+            id="misordered-blobs",
+        ),
+        pytest.param(lambda entries: [*entries[1:], entries[0]], id="metadata-last"),
+    ],
+)
+def test_import_rejects_bad_layouts(stored, repack):
+    archive = packed(repack(members(exported())))
+    clear_metadata()
+
+    with pytest.raises(ValueError):
+        import_archive(archive)
+
+
+def test_import_rejects_truncated_archives(stored):
+    data = exported().getvalue()
+    clear_metadata()
+
+    with pytest.raises((ValueError, tarfile.TarError)):
+        import_archive(io.BytesIO(data[: len(data) // 2]))
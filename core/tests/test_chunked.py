@@ -0,0 +1,90 @@
+import os
+
+import pytest
+from redbaby.errors import DocumentNotFound
+
+from frieles import Store
+from frieles.schemas import Chunk, ChunkManifest, LocalStoreConfig, Location
+from frieles.store import iter_chunked_blob
+
+CONTENT = os.urandom(50_000)
+
+
+def manifest_refs() -> list[int]:
+    return [m["refs"] for m in ChunkManifest.collection().find({}, {"refs": 1})]
+
+
+def test_same_content_shares_one_manifest(location, make_file):
+    Store.create_one(make_file(location, CONTENT, run="a"), chunked=True)
+    Store.create_one(make_file(location, CONTENT, run="b"), chunked=True)
+
+    assert manifest_refs() == [2]
+
+
+def test_delete_keeps_chunks_still_referenced(location, make_file):
+    Store.create_one(make_file(location, CONTENT, run="a"), chunked=True)
+    Store.create_one(make_file(location, CONTENT, run="b"), chunked=True)
+
+    Store.delete(search_tags={"run": "a"})
+
+    assert manifest_refs() == [1]
+    (file,) = Store.read(return_blob=True)
+    assert file.blob.content == CONTENT
+
+    Store.delete(search_tags={"run": "b"})
+
+    assert ChunkManifest.collection().count_documents({}) == 0
+    assert Chunk.collection().count_documents({}) == 0
+    assert not [p for p in location.config.directory.rglob("*") if p.is_file()]
+
+
+def test_manifest_is_per_location(location, make_file, tmp_path_factory):
+    other = Location(
+        provider="local",
+        config=LocalStoreConfig(directory=tmp_path_factory.mktemp("other")),
+    )
+    Store.create_one(make_file(location, CONTENT, run="a"), chunked=True)
+    Store.create_one(make_file(other, CONTENT, run="b"), chunked=True)
+
+    assert manifest_refs() == [1, 1]
+
+    Store.delete(search_tags={"run": "a"})
+
+    (blob_ref,) = {m["blob_ref"] for m in ChunkManifest.collection().find()}
+    assert b"".join(iter_chunked_blob(blob_ref, other)) == CONTENT
+    with pytest.raises(DocumentNotFound):
+        iter_chunked_blob(blob_ref, location)
+
+
+@pytest.mark.parametrize("kept", ["chunked", "plain"])
+def test_chunked_and_plain_blobs_do_not_collide(any_location, make_file, kept):
+    # below the chunker's minimum size, the only chunk is the whole content
+    content = b"small content"
+    Store.create_one(make_file(any_location, content, kind="chunked"), chunked=True)
+    Store.create_one(make_file(any_location, content, kind="plain"))
+
+    Store.delete(search_tags={"kind": "plain" if kept == "chunked" else "chunked"})
+
+    (file,) = Store.read(fields=["blob_ref"])
+    assert b"".join(Store.stream(file.blob_ref)) == content
+
+    Store.delete(search_tags={"kind": kept})
+    assert list(Store.read(raw=True)) == []
+    assert Chunk.collection().count_documents({}) == 0
+
+
+def test_repeated_chunks_are_counted_per_occurrence(location, make_file):
+    content = os.urandom(40_000) * 4
+    Store.create_one(make_file(location, content, run="a"), chunked=True)
+
+    (manifest,) = ChunkManifest.collection().find()
+    assert len(set(manifest["chunks"])) < len(manifest["chunks"])
+    refs = {c["chunk_ref"]: c["refs"] for c in Chunk.collection().find()}
+    assert sum(refs.values()) == len(manifest["chunks"])
+    (file,) = Store.read(fields=["blob_ref"])
+    assert b"".join(Store.stream(file.blob_ref)) == content
+
+    Store.delete(search_tags={"run": "a"})
+
+    assert Chunk.collection().count_documents({}) == 0
+    assert not [p for p in location.config.directory.rglob("*") if p.is_file()]
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+from redbaby.hashing import get_hash
+
+from frieles.hashing import BlobHasher
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        b"plain",
+        b"it's",
+        b'say "hi"',
+        b'it\'s "quoted"',
+        b"back\\slash \\' and \\",
+        bytes(range(256)),
+        os.urandom(10_000),
+    ],
+)
+@pytest.mark.parametrize("piece_size", [1, 3, 4096])
+def test_blob_ref_matches_get_hash(content, piece_size):
+    hasher = BlobHasher()
+    for start in range(0, len(content), piece_size):
+        hasher.update(content[start : start + piece_size])
+
+    assert hasher.blob_ref() == get_hash(str(content))
@@ -0,0 +1,212 @@
+import time
+
+import pytest
+
+from frieles import Store, instrumentation
+from frieles.instrumentation import (
+    MetricsRegistry,
+    Observation,
+    instrumented,
+    instrumented_iter,
+    observe,
+    observe_iter,
+)
+
+# long enough to dominate the overhead of the instrumentation itself
+STEP = 0.02
+
+
+class Recorder(instrumentation.Hook):
+    def __init__(self) -> None:
+        self.started: list[str] = []
+        self.ended: list[tuple[str, str, int, type | None, float]] = []
+
+    def on_start(self, observation: Observation) -> str:
+        self.started.append(observation.operation)
+        return observation.operation
+
+    def on_end(self, observation: Observation, state: str, duration: float) -> None:
+        assert state == observation.operation
+        self.ended.append(
+            (
+                observation.operation,
+                observation.provider,
+                observation.nbytes,
+                observation.error,
+                duration,
+            )
+        )
+
+    def durations(self) -> dict[str, float]:
+        return {operation: duration for operation, *_, duration in self.ended}
+
+
+@pytest.fixture
+def recorder():
+    hook = Recorder()
+    instrumentation.add_hook(hook)
+    yield hook
+    instrumentation.remove_hook(hook)
+
+
+def slow_items(n: int):
+    for i in range(n):
+        time.sleep(STEP)
+        yield b"x" * (i + 1)
+
+
+def test_observe_without_hooks_is_a_shared_noop():
+    assert observe("a") is observe("b", "s3")
+    assert list(observe_iter([1, 2], "a")) == [1, 2]
+
+
+def test_observe_records_bytes_and_errors(recorder):
+    with observe("driver.insert", "s3") as obs:
+        obs.record_bytes(3)
+        obs.record_bytes(4)
+    with pytest.raises(KeyError):
+        with observe("driver.find", "local"):
+            raise KeyError("missing")
+
+    assert [entry[:4] for entry in recorder.ended] == [
+        ("driver.insert", "s3", 7, None),
+        ("driver.find", "local", 0, KeyError),
+    ]
+
+
+def test_hooks_are_added_once(recorder):
+    instrumentation.add_hook(recorder)
+
+    with observe("store.read_one"):
+        pass
+
+    assert recorder.started == ["store.read_one"]
+
+
+def test_instrumented_observes_every_call(recorder):
+    @instrumented("store.usage")
+    def usage(value):
+        return value
+
+    assert usage(1) == 1
+    assert usage(2) == 2
+    assert recorder.started == ["store.usage", "store.usage"]
+
+
+def test_observe_iter_counts_only_producing_time(recorder):
+    rows = observe_iter(slow_items(3), "metadata.find", nbytes=len)
+
+    for _ in rows:
+        assert recorder.ended == []
+        time.sleep(2 * STEP)
+
+    ((operation, _, nbytes, error, duration),) = recorder.ended
+    assert (operation, nbytes, error) == ("metadata.find", 6, None)
+    assert 3 * STEP <= duration < 6 * STEP
+
+
+def test_observe_iter_ends_when_closed_or_failed(recorder):
+    def failing():
+        yield b"a"
+        raise OSError("connection lost")
+
+    rows = observe_iter(slow_items(3), "closed")
+    next(rows)
+    rows.close()
+    with pytest.raises(OSError):
+        list(observe_iter(failing(), "failed"))
+
+    assert [entry[:4] for entry in recorder.ended] == [
+        ("closed", "any", 0, None),
+        ("failed", "any", 0, OSError),
+    ]
+
+
+def test_instrumented_iter_times_the_whole_iteration(recorder):
+    @instrumented_iter("store.stream", nbytes=len)
+    def stream(n):
+        time.sleep(STEP)
+        return slow_items(n)
+
+    chunks = stream(2)
+    assert recorder.ended == []
+    assert list(chunks) == [b"x", b"xx"]
+
+    ((_, _, nbytes, _, duration),) = recorder.ended
+    assert nbytes == 3
+    assert duration >= 3 * STEP
+
+
+def test_instrumented_iter_records_failed_calls(recorder):
+    @instrumented_iter("store.read")
+    def read():
+        raise ValueError("bad filters")
+
+    with pytest.raises(ValueError):
+        read()
+
+    assert [entry[:4] for entry in recorder.ended] == [
+        ("store.read", "any", 0, ValueError)
+    ]
+
+
+def test_store_read_is_observed_until_exhausted(recorder, location, make_file):
+    for name in ("a", "b"):
+        Store.create_one(make_file(location, name.encode() * 10, name=name))
+    recorder.ended.clear()
+
+    files = Store.read(return_blob=True)
+    assert "store.read" not in recorder.durations()
+    assert len(list(files)) == 2
+
+    operations = [operation for operation, *_ in recorder.ended]
+    assert operations.count("blob.find") == 2
+    # the blob reads happen while iterating, inside the read observation
+    assert operations[-1] == "store.read"
+    durations = recorder.durations()
+    assert durations["store.read"] >= durations["blob.find"]
+
+
+def ended(registry: MetricsRegistry, duration: float, **kwargs) -> None:
+    observation = Observation(
+        kwargs.pop("operation", "store.read_one"), kwargs.pop("provider", "s3"), ()
+    )
+    for name, value in kwargs.items():
+        setattr(observation, name, value)
+    registry.on_end(observation, None, duration)
+
+
+def test_render_accumulates_buckets():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    for duration in (0.05, 0.1, 0.5, 5.0):
+        ended(registry, duration, nbytes=10)
+
+    lines = registry.render().splitlines()
+
+    labels = 'operation="store.read_one",provider="s3"'
+    bucket = "frieles_operation_duration_seconds_bucket"
+    assert f'{bucket}{{{labels},le="0.1"}} 2' in lines
+    assert f'{bucket}{{{labels},le="1.0"}} 3' in lines
+    assert f'{bucket}{{{labels},le="+Inf"}} 4' in lines
+    assert f"frieles_operation_duration_seconds_count{{{labels}}} 4" in lines
+    assert f"frieles_operation_duration_seconds_sum{{{labels}}} 5.65" in lines
+    assert f"frieles_operation_bytes_total{{{labels}}} 40" in lines
+    assert f"frieles_operation_errors_total{{{labels}}} 0" in lines
+
+
+def test_render_counts_errors_per_series():
+    registry = MetricsRegistry()
+    ended(registry, 0.01, error=KeyError)
+    ended(registry, 0.01)
+    ended(registry, 0.01, operation="blob.find", provider="local", error=OSError)
+
+    lines = registry.render().splitlines()
+
+    errors = [line for line in lines if line.startswith("frieles_operation_errors")]
+    assert errors == [
+        'frieles_operation_errors_total{operation="blob.find",provider="local"} 1',
+        'frieles_operation_errors_total{operation="store.read_one",provider="s3"} 1',
+    ]
+
+    registry.reset()
+    assert registry.snapshot() == {}
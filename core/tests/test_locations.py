@@ -0,0 +1,68 @@
+import pytest
+
+from frieles import Store
+from frieles.errors import AmbiguousFileError
+from frieles.schemas import File
+
+CONTENT = b"stored twice"
+
+
+@pytest.fixture
+def copies(location, s3_location, make_file):
+    """The same content stored as a file in two locations."""
+
+    Store.create_one(make_file(location, CONTENT, copy="local"))
+    Store.create_one(make_file(s3_location, CONTENT, copy="s3"))
+    (blob_ref,) = File.collection().distinct("blob_ref")
+    return blob_ref, location, s3_location
+
+
+def test_single_file_operations_refuse_ambiguous_refs(copies):
+    blob_ref, _, _ = copies
+
+    with pytest.raises(AmbiguousFileError):
+        Store.read_one(blob_ref)
+    with pytest.raises(AmbiguousFileError):
+        Store.update_one(blob_ref, search_tags={"copy": "either"})
+    with pytest.raises(AmbiguousFileError):
+        Store.delete_one(blob_ref)
+    with pytest.raises(AmbiguousFileError):
+        Store.presign_read(blob_ref)
+    with pytest.raises(AmbiguousFileError):
+        list(Store.stream(blob_ref))
+
+    assert File.collection().count_documents({}) == 2
+
+
+def test_read_one_in_location(copies):
+    blob_ref, local, s3 = copies
+
+    file = Store.read_one(blob_ref, return_blob=True, stored_in=s3)
+
+    assert file.location == s3
+    assert file.blob.content == CONTENT
+    assert b"".join(Store.stream(blob_ref, stored_in=local)) == CONTENT
+    assert Store.presign_read(blob_ref, stored_in=s3).startswith("https://")
+
+
+def test_update_one_in_location(copies):
+    blob_ref, local, s3 = copies
+
+    Store.update_one(blob_ref, search_tags={"copy": "moved"}, stored_in=local)
+
+    tags = {
+        doc["location"]["provider"]: doc["search_tags"]
+        for doc in File.collection().find()
+    }
+    assert tags == {"local": {"copy": "moved"}, "s3": {"copy": "s3"}}
+
+
+def test_delete_one_in_location(copies):
+    blob_ref, local, s3 = copies
+
+    result = Store.delete_one(blob_ref, stored_in=s3)
+
+    assert result.deleted_count == 1
+    file = Store.read_one(blob_ref, return_blob=True)
+    assert file.location == local
+    assert file.blob.content == CONTENT
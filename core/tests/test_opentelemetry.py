@@ -0,0 +1,69 @@
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry import trace  # noqa: E402
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+
+from frieles import instrumentation  # noqa: E402
+from frieles.instrumentation import observe, observe_iter  # noqa: E402
+
+exporter = InMemorySpanExporter()
+
+
+@pytest.fixture(autouse=True)
+def hook(monkeypatch):
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(trace, "get_tracer", provider.get_tracer)
+    hook = instrumentation.OpenTelemetryHook()
+    instrumentation.add_hook(hook)
+    yield hook
+    instrumentation.remove_hook(hook)
+    exporter.clear()
+
+
+def spans() -> dict:
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+def test_nested_operations_are_child_spans():
+    with observe("store.create_one"):
+        with observe("driver.insert", "s3") as obs:
+            obs.record_bytes(3)
+
+    finished = spans()
+    parent, child = (
+        finished["frieles.store.create_one"],
+        finished["frieles.driver.insert"],
+    )
+    assert child.parent.span_id == parent.context.span_id
+    assert child.attributes == {"frieles.provider": "s3", "frieles.bytes": 3}
+    assert trace.get_current_span() is trace.INVALID_SPAN
+
+
+def test_lazy_operations_do_not_stay_current():
+    rows = observe_iter([1, 2], "metadata.find")
+    next(rows)
+    with observe("driver.find"):
+        pass
+    list(rows)
+
+    finished = spans()
+    assert finished["frieles.driver.find"].parent is None
+    assert finished["frieles.metadata.find"].parent is None
+
+
+def test_failures_set_an_error_status():
+    with pytest.raises(KeyError):
+        with observe("store.read_one"):
+            raise KeyError("missing")
+
+    (span,) = exporter.get_finished_spans()
+    assert span.status.status_code is trace.StatusCode.ERROR
+    assert span.status.description == "KeyError"
+    assert trace.get_current_span() is trace.INVALID_SPAN
@@ -0,0 +1,109 @@
+import pytest
+from bson import ObjectId
+
+from frieles import Store
+from frieles.schemas import FileRecord
+from frieles.store import _projection
+
+
+@pytest.fixture
+def store_file(location, make_file):
+    def store(content: bytes = b"content") -> str:
+        Store.create_one(make_file(location, content))
+        (doc,) = Store.read(raw=True)
+        return doc.blob_ref
+
+    return store
+
+
+@pytest.mark.parametrize(
+    ("fields", "return_blob", "expected"),
+    [
+        (None, False, None),
+        (None, True, None),
+        ([], False, {"_id": 1}),
+        (["id", "metadata.path"], False, {"_id": 1, "metadata.path": 1}),
+        (["metadata", "metadata.path"], False, {"_id": 1, "metadata": 1}),
+        (["metadata.path", "metadata"], False, {"_id": 1, "metadata": 1}),
+        (
+            ["location.config.directory"],
+            True,
+            {"_id": 1, "blob_ref": 1, "location": 1, "chunked": 1},
+        ),
+    ],
+)
+def test_projection(fields, return_blob, expected):
+    assert _projection(fields, return_blob) == expected
+
+
+def test_read_one_empty_fields_loads_only_the_id(store_file):
+    blob_ref = store_file()
+
+    record = Store.read_one(blob_ref, return_blob=False, fields=[])
+
+    assert isinstance(record, FileRecord)
+    assert isinstance(record.id, ObjectId)
+    assert record.to_dict() == {"_id": record.id}
+
+
+def test_read_colliding_fields(store_file):
+    store_file()
+
+    (record,) = Store.read(fields=["metadata", "metadata.path"])
+
+    assert record.metadata["path"] == "/tests/file.txt"
+    assert record.metadata["mimetype"] == "text/plain"
+    assert record.blob_ref is None
+
+
+def test_read_one_raw_with_blob(store_file):
+    blob_ref = store_file(b"raw content")
+
+    record = Store.read_one(blob_ref, return_blob=True, raw=True)
+
+    assert isinstance(record, FileRecord)
+    assert record.blob.content == b"raw content"
+    assert record.created_by == {"name": "tester"}
+
+
+def test_read_projected_with_blob(store_file):
+    blob_ref = store_file(b"projected")
+
+    (record,) = Store.read(return_blob=True, fields=["metadata.path"])
+
+    assert record.blob.content == b"projected"
+    assert record.blob_ref == blob_ref
+    assert record.metadata == {"path": "/tests/file.txt"}
+    assert record.created_by is None
+
+
+def test_record_to_dict(store_file):
+    blob_ref = store_file(b"as dict")
+
+    record = Store.read_one(blob_ref, return_blob=True, raw=True)
+    data = record.to_dict()
+
+    assert data["_id"] == record.id
+    assert "id" not in data
+    assert data["blob_ref"] == blob_ref
+    assert data["blob"] == {"content": b"as dict"}
+    assert data["search_tags"] == {"origin": "test"}
+    assert data["chunked"] is False
+
+
+def test_record_to_dict_skips_unloaded_fields(store_file):
+    blob_ref = store_file()
+
+    record = Store.read_one(
+        blob_ref, return_blob=False, fields=["blob_ref", "search_tags"]
+    )
+
+    assert set(record.to_dict()) == {"_id", "blob_ref", "search_tags"}
+
+
+def test_read_validated_keeps_creator(store_file):
+    blob_ref = store_file()
+
+    file = Store.read_one(blob_ref, return_blob=False)
+
+    assert file.model_dump()["created_by"] == {"name": "tester"}
@@ -0,0 +1,49 @@
+from frieles import Store
+from frieles.schemas import File, Location, MongoStoreConfig
+
+
+def stored(location, make_file, extras: dict) -> tuple[str, dict]:
+    file = make_file(location, b"content")
+    file.metadata.extras = extras
+    Store.create_one(file)
+    doc = File.collection().find_one()
+    return doc["blob_ref"], file.metadata
+
+
+def test_update_replaces_location(location, make_file):
+    blob_ref, _ = stored(location, make_file, {})
+    target = Location(
+        provider="mongodb", config=MongoStoreConfig(database_uri="mongomock://")
+    )
+
+    Store.update_one(blob_ref, location=target)
+
+    doc = File.collection().find_one({"blob_ref": blob_ref})
+    # no key of the old local config is left behind
+    assert doc["location"] == target.model_dump()
+    assert "directory" not in doc["location"]["config"]
+
+
+def test_update_replaces_extras(location, make_file):
+    blob_ref, metadata = stored(location, make_file, {"a": 1, "b": 2})
+
+    Store.update_one(
+        blob_ref,
+        metadata=metadata.model_copy(update={"extras": {"c": 3}}),
+    )
+
+    doc = File.collection().find_one({"blob_ref": blob_ref})
+    assert doc["metadata"]["extras"] == {"c": 3}
+
+
+def test_update_moves_usage(location, make_file):
+    blob_ref, metadata = stored(location, make_file, {})
+
+    Store.update_one(
+        blob_ref,
+        metadata=metadata.model_copy(update={"mimetype": "application/json"}),
+    )
+
+    assert Store.usage(group_by=["mimetype"]) == [
+        {"mimetype": "application/json", "count": 1, "size_bytes": 7}
+    ]
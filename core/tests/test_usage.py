@@ -0,0 +1,110 @@
+import io
+
+import pytest
+
+from frieles import Store
+from frieles.archive import export_archive, import_archive
+from frieles.schemas import File, LocalStoreConfig, Location, Usage
+from frieles.usage import rebuild_usage
+
+
+def by_provider() -> dict[str, tuple[int, int]]:
+    return {
+        group["provider"]: (group["count"], group["size_bytes"])
+        for group in Store.usage(group_by=["provider"])
+    }
+
+
+@pytest.fixture
+def other(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("other")
+    return Location(provider="local", config=LocalStoreConfig(directory=directory))
+
+
+def test_create_one_counts_files(location, s3_location, make_file):
+    Store.create_one(make_file(location, b"abc"))
+    Store.create_one(make_file(location, b"defgh"))
+    Store.create_one(make_file(s3_location, b"ij"))
+
+    assert Store.usage() == [
+        {
+            "provider": "local",
+            "created_by": {"name": "tester"},
+            "mimetype": "text/plain",
+            "count": 2,
+            "size_bytes": 8,
+        },
+        {
+            "provider": "s3",
+            "created_by": {"name": "tester"},
+            "mimetype": "text/plain",
+            "count": 1,
+            "size_bytes": 2,
+        },
+    ]
+    assert Store.usage(group_by=[]) == [{"count": 3, "size_bytes": 10}]
+
+
+def test_create_many_counts_every_batch(location, make_file):
+    files = (make_file(location, bytes([i]) * (i + 1)) for i in range(5))
+
+    Store.create_many(files, batch_size=2)
+
+    assert by_provider() == {"local": (5, 15)}
+
+
+def test_delete_one_uncounts_the_file(location, make_file):
+    Store.create_one(make_file(location, b"abc"))
+    Store.create_one(make_file(location, b"defgh"))
+    (blob_ref,) = File.collection().distinct("blob_ref", {"metadata.size_bytes": 3})
+
+    Store.delete_one(blob_ref)
+
+    assert by_provider() == {"local": (1, 5)}
+
+
+def test_delete_uncounts_matching_files(location, s3_location, make_file):
+    Store.create_one(make_file(location, b"abc", run="a"))
+    Store.create_one(make_file(location, b"defgh", run="b"))
+    Store.create_one(make_file(s3_location, b"ij", run="a"))
+
+    Store.delete(search_tags={"run": "a"})
+
+    assert by_provider() == {"local": (1, 5)}
+
+    Store.delete()
+
+    # emptied counters are left at zero but not reported
+    assert Store.usage() == []
+    assert {(u["count"], u["size_bytes"]) for u in Usage.collection().find()} == {
+        (0, 0)
+    }
+
+
+def test_import_counts_imported_files_only(location, other, make_file):
+    Store.create_one(make_file(location, b"abc"))
+    Store.create_one(make_file(location, b"defgh"))
+    archive = io.BytesIO()
+    export_archive(archive)
+
+    archive.seek(0)
+    import_archive(archive)
+    assert by_provider() == {"local": (2, 8)}
+
+    archive.seek(0)
+    import_archive(archive, location=other)
+    assert by_provider() == {"local": (4, 16)}
+
+
+def test_rebuild_usage_repairs_drifted_counters(location, s3_location, make_file):
+    Store.create_one(make_file(location, b"abc"))
+    Store.create_one(make_file(s3_location, b"defgh"))
+    expected = Store.usage()
+    # writes made outside Store leave the counters behind
+    File.collection().delete_one({"location.provider": "s3"})
+    Usage.collection().update_many({}, {"$inc": {"count": 7}})
+
+    assert rebuild_usage() == 1
+
+    assert Store.usage() == expected[1:]
+    assert Usage.collection().count_documents({}) == 1